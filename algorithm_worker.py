@@ -0,0 +1,140 @@
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from algorithms import SOLVERS, PuzzleAlgorithms, SearchTimeout
+from parallel_search import SearchWorkerError
+
+PROGRESS_INTERVAL = 0.2  # Seconds between progress reports of run_algorithm
+
+
+def limit_memory(memory_limit):
+    """Cap the address space of the current process at ``memory_limit`` MB."""
+    if resource is None or not memory_limit:
+        return
+    limit = memory_limit * 1024 * 1024
+    _, hard_limit = resource.getrlimit(resource.RLIMIT_AS)
+    if hard_limit != resource.RLIM_INFINITY:
+        limit = min(limit, hard_limit)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard_limit))
+
+
+def peak_rss():
+    """Peak resident set size of the current process in KB (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def cpu_time():
+    """CPU seconds used by this process and by its children that have ended.
+
+    Children count once they have exited and been joined, as the worker
+    processes of Parallel A* are when the search returns.
+    """
+    if resource is None:
+        return time.process_time()
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def measure_algorithm(
+    algorithm,
+    heuristic,
+    size,
+    tiles,
+    empty_tile,
+    time_limit=None,
+    memory_limit=None,
+    observer=None,
+    solution_observer=None,
+):
+    """Run one algorithm and return a result dict with its path and statistics.
+
+    Meant to run in a worker process, so that searches run on their own core
+    without sharing the GUI's interpreter lock and ``peak_rss`` reflects this
+    search alone. ``time_limit`` is in seconds and ``memory_limit`` in MB;
+    exceeding either is reported in the result's ``error`` instead of a path.
+    ``observer`` receives the progress metrics of PuzzleAlgorithms.sample and
+    ``solution_observer`` every (path, bound) found by Anytime A*.
+    """
+    limit_memory(memory_limit)
+
+    result = {"algorithm": algorithm, "heuristic": heuristic}
+    start_time = time.perf_counter()
+    start_cpu_time = cpu_time()
+    try:
+        alg = PuzzleAlgorithms(size, tiles, empty_tile, heuristic)
+        alg.observer = observer
+        alg.solution_observer = solution_observer
+        if time_limit:
+            alg.deadline = time.monotonic() + time_limit
+        path, nodes_expanded, nodes_stored = getattr(alg, SOLVERS[algorithm])()
+    except SearchTimeout:
+        result["error"] = "Time limit exceeded"
+    except MemoryError:
+        result["error"] = "Memory limit exceeded"
+    except (ValueError, SearchWorkerError) as error:
+        result["error"] = str(error)
+    else:
+        # Some searches include the starting empty tile in their path
+        if path and path[0] == tuple(empty_tile):
+            path = path[1:]
+        result["path"] = path
+        result["nodes_expanded"] = nodes_expanded
+        result["nodes_stored"] = nodes_stored
+        result["ida_iterations"] = alg.ida_iterations
+        result["anytime_solutions"] = alg.anytime_solutions
+
+    result["wall_time"] = time.perf_counter() - start_time
+    result["cpu_time"] = cpu_time() - start_cpu_time
+    result["peak_rss"] = peak_rss()
+    return result
+
+
+def run_algorithm(
+    algorithm,
+    heuristic,
+    size,
+    tiles,
+    empty_tile,
+    result_queue,
+    time_limit=None,
+    memory_limit=None,
+):
+    """Process target reporting a measure_algorithm run on ``result_queue``.
+
+    Progress metrics are put on the queue as ``("progress", metrics)`` at
+    most every PROGRESS_INTERVAL seconds, every Anytime A* solution as
+    ``("solution", (path, bound))`` and the result as ``("result", result)``.
+    """
+    last_report = time.monotonic()
+
+    def report_progress(metrics):
+        nonlocal last_report
+        now = time.monotonic()
+        if now - last_report >= PROGRESS_INTERVAL:
+            last_report = now
+            result_queue.put(("progress", metrics))
+
+    def report_solution(path, bound):
+        result_queue.put(("solution", (path, bound)))
+
+    result = measure_algorithm(
+        algorithm,
+        heuristic,
+        size,
+        tiles,
+        empty_tile,
+        time_limit,
+        memory_limit,
+        report_progress,
+        report_solution,
+    )
+    result_queue.put(("result", result))
@@ -1,236 +1,1176 @@
 import heapq
+import math
+import os
+import tempfile
+import time
 from collections import deque
+from functools import cached_property
+
+import constructive_solver
+import distance_table
+import external_search
+import parallel_search
+import state_table
+import successors
+import vectorized_search
+from board_encoding import BoardEncoding
+from heuristics import ManhattanDistance, make_heuristic
+from open_list import BucketOpenList
+
+# Expansions between two checks of the search deadline (and progress samples)
+CHECK_INTERVAL = 1024
+
+# Rough memory use in bytes of a stored state (with its dict entries) and of
+# an open list entry, for the memory estimate of progress samples
+STORED_NODE_BYTES = 64
+OPEN_NODE_BYTES = 96
+
+
+class UnsolvablePuzzleError(ValueError):
+    """Raised when the goal cannot be reached from the given board."""
+
+
+class SearchTimeout(Exception):
+    """Raised when a search runs past its deadline."""
 
 
 class PuzzleAlgorithms:
     """Class to handle puzzle algorithms.
 
     Implemented algorithms:
-        - BFS
+        - BFS (and vectorized NumPy and external-memory versions)
         - Bidirectional
-        - A*
+        - Bidirectional MM (heuristic-guided)
+        - A* (and a parallel HDA* version)
+        - Weighted A* and anytime A* (ARA*)
+        - IDA*
+        - Distance table lookup (3x3 only)
     """
 
-    def __init__(self, size, tiles, empty_tile):
+    def __init__(self, size, tiles, empty_tile, heuristic=None, goal=None):
         self.size = size
         self.tiles = tiles
         self.empty_tile = empty_tile
 
+        # Searches work on packed integer states, see BoardEncoding
+        goal_tiles = None if goal is None else [tile for row in goal for tile in row]
+        self.encoding = BoardEncoding(size, goal_tiles)
+        self.initial_state, self.initial_blank = self.encoding.encode_tiles(tiles)
+        # Cells the empty tile can move to from every cell, see successors
+        self.neighbors = successors.neighbor_table(size)
+        # Heuristic used by the informed searches: a name from
+        # heuristics.HEURISTICS or any object with the evaluate/update
+        # interface of heuristics.ManhattanDistance, see estimator
+        self.heuristic_name = heuristic
+
+        # (bound, nodes expanded) for every iteration of the last ida_star run
+        self.ida_iterations = []
+        # Whether ida_star skips redundant move sequences beyond undoing the
+        # last move, see successors.pruning_automaton
+        self.prune_sequences = True
+
+        # Heuristic weight of weighted_a_star, and the weight of the first
+        # anytime_search pass and how much it drops between passes
+        self.weight = 2
+        self.anytime_weight = 3
+        self.weight_step = 0.5
+        # (moves, suboptimality bound) of every solution of the last
+        # anytime_a_star run, and a callable receiving (path, bound) as soon as
+        # each one is found
+        self.anytime_solutions = []
+        self.solution_observer = None
+
+        # Most children external_bfs holds in memory before writing them to
+        # a sorted run on disk, and the directory for its layer files (None
+        # for the system's temporary directory)
+        self.external_memory = 1_000_000
+        self.external_directory = None
+
+        # Worker processes of parallel_a_star (None for one per CPU core)
+        self.parallel_workers = None
+
+        # time.monotonic() value after which searches raise SearchTimeout
+        self.deadline = None
+
+        # Callable receiving a dict of metrics every CHECK_INTERVAL
+        # expansions of a search, see sample
+        self.observer = None
+        self.progress_start = None
+        self.last_sample = None
+        self.depth_counts = {}
+
+    @cached_property
+    def estimator(self):
+        """The heuristic of the informed searches, built on first use.
+
+        Blind searches never build it, so a heuristic that does not fit the
+        board (or has no tables yet) only fails the searches that use it.
+        """
+        return make_heuristic(self.heuristic_name, self.encoding)
+
+    def check_deadline(self):
+        """Abort the running search if it has passed its deadline."""
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise SearchTimeout("Search exceeded its time limit")
+
+    def start_progress(self):
+        """Reset the progress metrics at the start of a search."""
+        if self.observer is not None:
+            self.progress_start = time.perf_counter()
+            self.last_sample = (self.progress_start, 0)
+            self.depth_counts = {}
+
+    def sample(self, nodes_expanded, open_size, stored, depth, bound=None):
+        """Send the progress metrics of the running search to ``self.observer``.
+
+        Searches call this next to check_deadline when an observer is set, so
+        observing costs nothing while it is not. The metrics are the elapsed
+        time, nodes expanded and expansions per second since the last sample,
+        the open list size, the number of stored states, the depth (path
+        cost) of the node being expanded, the current f-bound (or searched
+        depth), an estimate of the expansions at every depth and a rough
+        estimate of the memory used in bytes.
+        """
+        now = time.perf_counter()
+        last_time, last_expanded = self.last_sample
+        self.last_sample = (now, nodes_expanded)
+        # Expansions since the last sample are counted at the current depth
+        self.depth_counts[depth] = (
+            self.depth_counts.get(depth, 0) + nodes_expanded - last_expanded
+        )
+        self.observer(
+            {
+                "elapsed": now - self.progress_start,
+                "nodes_expanded": nodes_expanded,
+                "expansions_per_second": (nodes_expanded - last_expanded)
+                / max(now - last_time, 1e-9),
+                "open": open_size,
+                "stored": stored,
+                "depth": depth,
+                "bound": bound,
+                "depth_counts": dict(self.depth_counts),
+                "memory": stored * STORED_NODE_BYTES + open_size * OPEN_NODE_BYTES,
+            }
+        )
+
     def bfs(self):
         """Performs a breadth-first search to solve the puzzle."""
-        initial_state = [tile for row in self.tiles for tile in row]
-        initial_empty_tile = self.get_empty_tile_coordinates(initial_state)
+        slide = self.encoding.slide
+        neighbors = self.neighbors
+        goal_state = self.encoding.goal
 
-        queue = deque([(initial_state, [])])
-        visited = set()
-        visited.add(tuple(initial_state))
+        queue = deque([(self.initial_state, self.initial_blank)])
+        # Maps every visited state to the empty tile index of its parent
+        came_from = state_table.parent_table(self.encoding)
+        came_from[self.initial_state] = -1
 
         nodes_expanded = 0  # Counter for expanded nodes
         nodes_stored = 1  # Start with the initial state counted as stored
+        self.start_progress()
 
         while queue:
-            current_state, path = queue.popleft()
+            current_state, empty_i = queue.popleft()
             nodes_expanded += 1  # Every time a node is dequeued, it's expanded
-            empty_y, empty_x = self.get_empty_tile_coordinates(current_state)
+            if nodes_expanded % CHECK_INTERVAL == 0:
+                self.check_deadline()
+                if self.observer is not None:
+                    depth = len(self.trace_back(came_from, current_state, empty_i))
+                    self.sample(nodes_expanded, len(queue), nodes_stored, depth - 1)
 
-            if self.is_solved(current_state):
-                return path, nodes_expanded, nodes_stored
+            if current_state == goal_state:
+                trace = self.trace_back(came_from, current_state, empty_i)
+                return self.to_path(trace[::-1][1:]), nodes_expanded, nodes_stored
 
-            for move in self.can_move_to((empty_y, empty_x)):
-                new_state = current_state[:]
-                self.move_to(new_state, move)
-                new_empty_tile = self.get_empty_tile_coordinates(new_state)
-                new_state_tuple = tuple(new_state)
+            parent_empty_i = came_from[current_state]
+            for new_empty_i in neighbors[empty_i]:
+                if new_empty_i == parent_empty_i:
+                    continue  # Undoing the last move leads back to the parent
+                new_state = slide(current_state, empty_i, new_empty_i)
 
-                if new_state_tuple not in visited:
-                    visited.add(new_state_tuple)
+                if came_from.add(new_state, empty_i):
                     nodes_stored += 1  # Count this new state as stored
-                    new_path = path + [new_empty_tile]
-                    queue.append((new_state, new_path))
+                    queue.append((new_state, new_empty_i))
 
         return None, nodes_expanded, nodes_stored  # If no solution is found
 
-    def bidirectional(self):
-        """Performs a bidirectional search to solve the puzzle."""
+    def vectorized_bfs(self):
+        """Performs a breadth-first search one whole layer at a time with NumPy.
+
+        Each layer is a sorted array of packed states. All children of a
+        layer are generated with array operations and deduplicated against
+        the previous layer with sorted-array lookups, see vectorized_search.
+        The path is traced back by finding a parent of each state in the
+        layer before it. Boards up to 4x4 only.
+        """
+        vectorized_search.check_available(self.encoding)
+        np = vectorized_search.np
+        bits = self.encoding.bits
+        goal_state = np.uint64(self.encoding.goal)
+        moves = vectorized_search.blank_moves(self.size)
+
+        layer = np.array([self.initial_state], dtype=np.uint64)
+        blanks = np.array([self.initial_blank], dtype=np.int64)
+        layers = [layer]
+        previous_layer = np.empty(0, dtype=np.uint64)
+
+        nodes_expanded = 0
+        nodes_stored = 1
+        self.start_progress()
+
+        while len(layer):
+            # Layers are checked for the goal before they are expanded
+            if vectorized_search.contains(layer, np.array([goal_state]))[0]:
+                index = int(np.searchsorted(layer, goal_state))
+                nodes_expanded += index + 1
+                trace = self.trace_layers(layers, int(blanks[index]))
+                return self.to_path(trace[::-1][1:]), nodes_expanded, nodes_stored
+
+            self.check_deadline()
+            nodes_expanded += len(layer)
+            next_states, next_blanks = vectorized_search.next_layer(
+                layer, blanks, previous_layer, moves, bits
+            )
+            previous_layer, layer, blanks = layer, next_states, next_blanks
+            layers.append(layer)
+            nodes_stored += len(layer)
+            if self.observer is not None:
+                depth = len(layers) - 1
+                self.sample(nodes_expanded, len(layer), nodes_stored, depth, depth)
+
+        return None, nodes_expanded, nodes_stored  # If no solution is found
+
+    def trace_layers(self, layers, empty_i):
+        """Trace the goal back through the BFS layers of vectorized_bfs.
+
+        Returns the empty tile indices from the goal (in the last layer) back
+        to the starting board, both included.
+        """
+        contains = vectorized_search.contains
+        np = vectorized_search.np
+        slide = self.encoding.slide
+        state = self.encoding.goal
+        trace = [empty_i]
+
+        for layer in reversed(layers[:-1]):
+            for parent_empty_i in self.neighbors[empty_i]:
+                parent = slide(state, empty_i, parent_empty_i)
+                if contains(layer, np.array([parent], dtype=np.uint64))[0]:
+                    break
+            state, empty_i = parent, parent_empty_i
+            trace.append(empty_i)
+
+        return trace
+
+    def external_bfs(self):
+        """Performs a breadth-first search with its layers stored on disk.
+
+        Every layer is a file of sorted states. The children of a layer are
+        collected in memory up to ``self.external_memory`` states at a time,
+        and each batch is sorted and written to a run file. The runs are
+        then merged, skipping duplicates and any state of the previous
+        layer, into the next layer file. No state can reappear in its own
+        layer or any older one (see vectorized_search.next_layer), so RAM
+        stays capped however large the searched space grows. Stored counts
+        every state written to a layer file.
+        """
+        if self.external_memory < 1:
+            raise ValueError("external_memory must be at least one state")
+        encoding = self.encoding
+        slide = encoding.slide
+        neighbors = self.neighbors
+        goal_state = encoding.goal
+        size = external_search.record_size(encoding)
+
+        nodes_expanded = 0
+        nodes_stored = 1
+        self.start_progress()
+
+        with tempfile.TemporaryDirectory(
+            prefix="puzzle-bfs-", dir=self.external_directory
+        ) as directory:
+            layers = [external_search.layer_path(directory, 0)]
+            external_search.write_states(layers[0], [self.initial_state], size)
+            layer_size = 1
+
+            while layer_size:
+                depth = len(layers) - 1
+                if external_search.contains(layers[-1], size, goal_state):
+                    nodes_expanded += 1
+                    trace = self.trace_layer_files(layers, size)
+                    return self.to_path(trace[::-1][1:]), nodes_expanded, nodes_stored
+
+                runs = []
+                children = []
+                for expanded, state in enumerate(
+                    external_search.read_states(layers[-1], size)
+                ):
+                    nodes_expanded += 1
+                    if nodes_expanded % CHECK_INTERVAL == 0:
+                        self.check_deadline()
+                        if self.observer is not None:
+                            self.sample(
+                                nodes_expanded,
+                                layer_size - expanded,
+                                len(children),
+                                depth,
+                                depth,
+                            )
 
-        # Flatten the initial state and generate goal state
-        initial_state = [tile for row in self.tiles for tile in row]
-        goal_state = list(range(1, self.size**2)) + [None]
+                    empty_i = encoding.blank_index(state)
+                    for new_empty_i in neighbors[empty_i]:
+                        children.append(slide(state, empty_i, new_empty_i))
+                    if len(children) >= self.external_memory:
+                        runs.append(self.write_run(directory, len(runs), children))
+                        children = []
+                if children:
+                    runs.append(self.write_run(directory, len(runs), children))
+                    children = []
 
-        start_empty = self.get_empty_tile_coordinates(initial_state)
+                next_layer = external_search.merge_unique(
+                    external_search.read_states(run, size) for run in runs
+                )
+                if depth > 0:
+                    next_layer = external_search.subtract(
+                        next_layer, external_search.read_states(layers[-2], size)
+                    )
+                layers.append(external_search.layer_path(directory, depth + 1))
+                layer_size = external_search.write_states(layers[-1], next_layer, size)
+                nodes_stored += layer_size
+                for run in runs:
+                    os.remove(run)
+
+        return None, nodes_expanded, nodes_stored  # If no solution is found
+
+    def write_run(self, directory, index, states):
+        """Sort a batch of external_bfs children into a run file and return its path."""
+        path = os.path.join(directory, f"run-{index}.bin")
+        size = external_search.record_size(self.encoding)
+        external_search.write_states(path, sorted(set(states)), size)
+        return path
+
+    def trace_layer_files(self, layers, size):
+        """Trace the goal back through the layer files of external_bfs.
+
+        Returns the empty tile indices from the goal (in the last layer) back
+        to the starting board, both included.
+        """
+        slide = self.encoding.slide
+        state = self.encoding.goal
+        empty_i = self.encoding.goal_blank
+        trace = [empty_i]
 
-        # Initialize queues for forward and backward search
-        forward_queue = deque([(initial_state, [start_empty])])
-        backward_queue = deque([(goal_state, [(self.size - 1, self.size - 1)])])
+        for layer in reversed(layers[:-1]):
+            for parent_empty_i in self.neighbors[empty_i]:
+                parent = slide(state, empty_i, parent_empty_i)
+                if external_search.contains(layer, size, parent):
+                    break
+            state, empty_i = parent, parent_empty_i
+            trace.append(empty_i)
 
-        forward_visited = {tuple(initial_state): []}
-        backward_visited = {tuple(goal_state): []}
+        return trace
+
+    def bidirectional(self):
+        """Performs a bidirectional breadth-first search to solve the puzzle.
+
+        The searches run from the start and from the goal, each step
+        expanding the whole current layer of the side with the smaller
+        frontier. Every generated state is checked against the other side, so
+        the searches stop as soon as they meet. Since neither side had reached
+        the other before that layer, the path through the meeting state is
+        optimal.
+        """
+        slide = self.encoding.slide
+        neighbors = self.neighbors
+        initial_state = self.initial_state
+        goal_state = self.encoding.goal
+
+        # Parent links of each side, see trace_back
+        forward_visited = state_table.parent_table(self.encoding)
+        forward_visited[initial_state] = -1
+        backward_visited = state_table.parent_table(self.encoding)
+        backward_visited[goal_state] = -1
 
         nodes_expanded = 0  # Counter for the number of expanded nodes
         nodes_stored = 2  # Start with two initial states counted as stored
 
-        while forward_queue and backward_queue:
-            # Forward BFS step
-            if forward_queue:
-                f_state, f_path = forward_queue.popleft()
-                nodes_expanded += 1
-                f_empty_y, f_empty_x = self.get_empty_tile_coordinates(f_state)
+        if initial_state == goal_state:
+            return self.to_path([self.initial_blank]), nodes_expanded, nodes_stored
 
-                if tuple(f_state) in backward_visited:
-                    return (
-                        f_path[:-1] + backward_visited[tuple(f_state)][::-1],
-                        nodes_expanded,
-                        nodes_stored,
-                    )
+        forward_layer = [(initial_state, self.initial_blank)]
+        backward_layer = [(goal_state, self.encoding.goal_blank)]
+        forward_depth = backward_depth = 0  # Depth of each side's current layer
+        self.start_progress()
 
-                for move in self.can_move_to((f_empty_y, f_empty_x)):
-                    new_state = f_state[:]
-                    self.move_to(new_state, move)
-                    new_empty_tile = self.get_empty_tile_coordinates(new_state)
-                    new_state_tuple = tuple(new_state)
-
-                    if new_state_tuple not in forward_visited:
-                        new_path = f_path + [new_empty_tile]
-                        forward_visited[new_state_tuple] = new_path
-                        nodes_stored += 1  # Count this state as stored
-                        forward_queue.append((new_state, new_path))
-
-            # Backward BFS step
-            if backward_queue:
-                b_state, b_path = backward_queue.popleft()
+        while forward_layer and backward_layer:
+            # Expand the side with the smaller frontier
+            forward = len(forward_layer) <= len(backward_layer)
+            if forward:
+                layer, visited, other_visited = (
+                    forward_layer,
+                    forward_visited,
+                    backward_visited,
+                )
+            else:
+                layer, visited, other_visited = (
+                    backward_layer,
+                    backward_visited,
+                    forward_visited,
+                )
+
+            next_layer = []
+            for state, empty_i in layer:
                 nodes_expanded += 1
-                b_empty_y, b_empty_x = self.get_empty_tile_coordinates(b_state)
+                if nodes_expanded % CHECK_INTERVAL == 0:
+                    self.check_deadline()
+                    if self.observer is not None:
+                        self.sample(
+                            nodes_expanded,
+                            len(forward_layer) + len(backward_layer) + len(next_layer),
+                            nodes_stored,
+                            forward_depth if forward else backward_depth,
+                            forward_depth + backward_depth,
+                        )
 
-                if tuple(b_state) in forward_visited:
-                    return (
-                        forward_visited[tuple(b_state)][:-1] + b_path[::-1],
-                        nodes_expanded,
-                        nodes_stored,
-                    )
+                parent_empty_i = visited[state]
+                for new_empty_i in neighbors[empty_i]:
+                    if new_empty_i == parent_empty_i:
+                        continue  # Undoing the last move leads back to the parent
+                    new_state = slide(state, empty_i, new_empty_i)
+                    if not visited.add(new_state, empty_i):
+                        continue
 
-                for move in self.can_move_to((b_empty_y, b_empty_x)):
-                    new_state = b_state[:]
-                    self.move_to(new_state, move)
-                    new_empty_tile = self.get_empty_tile_coordinates(new_state)
-                    new_state_tuple = tuple(new_state)
+                    nodes_stored += 1
+                    if new_state in other_visited:
+                        return (
+                            self.join_paths(
+                                forward_visited,
+                                backward_visited,
+                                new_state,
+                                new_empty_i,
+                            ),
+                            nodes_expanded,
+                            nodes_stored,
+                        )
+                    next_layer.append((new_state, new_empty_i))
 
-                    if new_state_tuple not in backward_visited:
-                        new_path = b_path + [new_empty_tile]
-                        backward_visited[new_state_tuple] = new_path
-                        nodes_stored += 1  # Count this state as stored
-                        backward_queue.append((new_state, new_path))
+            if forward:
+                forward_layer = next_layer
+                forward_depth += 1
+            else:
+                backward_layer = next_layer
+                backward_depth += 1
 
         return None, nodes_expanded, nodes_stored  # If no solution is found
 
-    def heuristic(self, state, goal_state):
-        """Calculate the heuristic distance from the current state to the goal state."""
-        distance = 0
-        for i, tile in enumerate(state):
-            if tile is None:
-                continue  # Skip the empty tile
-            if tile in goal_state:
-                goal_index = goal_state.index(tile)
-                goal_y, goal_x = divmod(goal_index, self.size)
-                current_y, current_x = divmod(i, self.size)
-                distance += abs(goal_y - current_y) + abs(goal_x - current_x)
+    def bidirectional_mm(self):
+        """Performs a heuristic-guided bidirectional search (MM) to solve the puzzle.
+
+        Both sides are best-first searches ordered by max(f, 2g), the backward
+        side estimating the distance to the starting board. This makes the
+        two searches meet in the middle of an optimal path. The best path
+        through a state reached by both sides is returned once no open state
+        has a lower priority, which guarantees it is optimal.
+        """
+        slide = self.encoding.slide
+        tile_at = self.encoding.tile_at
+        neighbors = self.neighbors
+        initial_state = self.initial_state
+        goal_state = self.encoding.goal
+        backward_estimator = self.backward_heuristic()
+
+        # (priority, cost, state, empty_i, h) heaps and best known costs
+        forward_open = [
+            (
+                self.heuristic(initial_state),
+                0,
+                initial_state,
+                self.initial_blank,
+                self.heuristic(initial_state),
+            )
+        ]
+        backward_open = [
+            (
+                backward_estimator.evaluate(goal_state),
+                0,
+                goal_state,
+                self.encoding.goal_blank,
+                backward_estimator.evaluate(goal_state),
+            )
+        ]
+        forward_reached = {initial_state: 0}
+        backward_reached = {goal_state: 0}
+        # Parent links of each side, see trace_back
+        forward_came_from = {initial_state: -1}
+        backward_came_from = {goal_state: -1}
+
+        best_cost = float("inf")  # Length of the best path found so far
+        meeting = None  # (state, empty_i) that the best path goes through
+        if initial_state == goal_state:
+            best_cost, meeting = 0, (initial_state, self.initial_blank)
+
+        nodes_expanded = 0  # Counter for expanded nodes
+        nodes_stored = 2  # Start with two initial states counted as stored
+        self.start_progress()
+
+        while forward_open and backward_open:
+            # No open state can lead to a shorter path than the best one
+            if best_cost <= min(forward_open[0][0], backward_open[0][0]):
+                break
+
+            # Expand the side with the lowest priority, on ties the smaller one
+            if (forward_open[0][0], len(forward_open)) <= (
+                backward_open[0][0],
+                len(backward_open),
+            ):
+                open_list, reached, came_from, other_reached, update_h = (
+                    forward_open,
+                    forward_reached,
+                    forward_came_from,
+                    backward_reached,
+                    self.estimator.update,
+                )
             else:
-                distance += self.size  # This could be adjusted based on requirements
-        return distance
+                open_list, reached, came_from, other_reached, update_h = (
+                    backward_open,
+                    backward_reached,
+                    backward_came_from,
+                    forward_reached,
+                    backward_estimator.update,
+                )
+
+            priority, cost, state, empty_i, h = heapq.heappop(open_list)
+            if cost > reached[state]:
+                continue  # Outdated entry of a state reached more cheaply since
+
+            nodes_expanded += 1
+            if nodes_expanded % CHECK_INTERVAL == 0:
+                self.check_deadline()
+                if self.observer is not None:
+                    self.sample(
+                        nodes_expanded,
+                        len(forward_open) + len(backward_open),
+                        len(forward_reached) + len(backward_reached),
+                        cost,
+                        priority,
+                    )
+
+            new_cost = cost + 1
+            parent_empty_i = came_from[state]
+            for new_empty_i in neighbors[empty_i]:
+                if new_empty_i == parent_empty_i:
+                    continue  # Undoing the last move leads back to the parent
+                new_state = slide(state, empty_i, new_empty_i)
+                if new_cost >= reached.get(new_state, new_cost + 1):
+                    continue
 
-    def a_star(self):
-        """Performs the A* search algorithm to solve the puzzle."""
+                reached[new_state] = new_cost
+                came_from[new_state] = empty_i
+                nodes_stored += 1
 
-        # Replace None with 0 to prevent:
-        # TypeError: '<' not supported between instances of 'NoneType' and 'int'
-        # While trying to compare list items for pushing to the heapq or popping from it
-        initial_state = tuple(
-            tile if tile is not None else 0 for row in self.tiles for tile in row
+                other_cost = other_reached.get(new_state)
+                if other_cost is not None and new_cost + other_cost < best_cost:
+                    best_cost = new_cost + other_cost
+                    meeting = (new_state, new_empty_i)
+
+                tile = tile_at(state, new_empty_i)
+                new_h = update_h(h, state, new_state, tile, new_empty_i, empty_i)
+                if new_cost + new_h < best_cost:
+                    heapq.heappush(
+                        open_list,
+                        (
+                            max(new_cost + new_h, 2 * new_cost),
+                            new_cost,
+                            new_state,
+                            new_empty_i,
+                            new_h,
+                        ),
+                    )
+
+        if meeting is None:
+            return None, nodes_expanded, nodes_stored  # If no solution is found
+        return (
+            self.join_paths(forward_came_from, backward_came_from, *meeting),
+            nodes_expanded,
+            nodes_stored,
         )
 
-        # Use 0 instead of None for the reason above
-        # goal_state = tuple(range(1, self.size**2)) + (None,)
-        goal_state = tuple(range(1, self.size**2)) + (0,)
+    def backward_heuristic(self):
+        """Build the heuristic estimating the distance back to the starting board.
+
+        The selected heuristic is rebuilt with the starting board as its goal.
+        Heuristics that only support the usual goal (pattern databases) and
+        heuristic objects fall back to the Manhattan distance.
+        """
+        encoding = BoardEncoding(self.size, self.encoding.decode(self.initial_state))
+        if self.heuristic_name is None or isinstance(self.heuristic_name, str):
+            try:
+                return make_heuristic(self.heuristic_name, encoding)
+            except ValueError:
+                pass
+        return ManhattanDistance(encoding)
 
-        start_node = (initial_state, [self.empty_tile], 0)
-        # (f, new_cost, (new_state, new_path, new_cost))
-        frontier = [(self.heuristic(initial_state, goal_state), 0, start_node)]
-        reached = {initial_state: start_node}
+    def join_paths(self, forward_visited, backward_visited, state, empty_i):
+        """Build the full path through the state where both searches met."""
+        forward_trace = self.trace_back(forward_visited, state, empty_i)
+        backward_trace = self.trace_back(backward_visited, state, empty_i)
+        return self.to_path(forward_trace[::-1] + backward_trace[1:])
+
+    def heuristic(self, state, goal_state=None):
+        """Estimate the distance from a packed state to the goal state."""
+        return self.estimator.evaluate(state)
+
+    def a_star(self, weight=1):
+        """Performs the A* search algorithm to solve the puzzle.
+
+        A ``weight`` above 1 inflates the heuristic (weighted A*). This
+        expands far fewer nodes, and the solution is at most ``weight`` times
+        longer than optimal. The open list is a BucketOpenList, which holds
+        every state at most once and breaks ties on f towards higher cost.
+        Stored counts the distinct states reached.
+        """
+        slide = self.encoding.slide
+        tile_at = self.encoding.tile_at
+        update_h = self.estimator.update
+        neighbors = self.neighbors
+        initial_state = self.initial_state
+        goal_state = self.encoding.goal
+
+        h = self.heuristic(initial_state)
+        frontier = BucketOpenList()
+        frontier.push(weight * h, 0, initial_state, self.initial_blank, h)
+        reached = {initial_state: 0}
+        came_from = {initial_state: -1}
 
         nodes_expanded = 0  # Counter for expanded nodes
-        nodes_stored = 1  # Start with the initial state counted as stored
+        self.start_progress()
 
         while frontier:
-            _, __, node = heapq.heappop(frontier)
-            current_state, path, cost = node
+            f, cost, current_state, empty_i, h = frontier.pop()
             nodes_expanded += 1  # Every time a node is dequeued, it's expanded
+            if nodes_expanded % CHECK_INTERVAL == 0:
+                self.check_deadline()
+                if self.observer is not None:
+                    self.sample(nodes_expanded, len(frontier), len(reached), cost, f)
 
             if current_state == goal_state:
-                return path, nodes_expanded, nodes_stored
+                trace = self.trace_back(came_from, current_state, empty_i)
+                return self.to_path(trace[::-1]), nodes_expanded, len(reached)
 
-            empty_y, empty_x = self.get_empty_tile_coordinates(current_state, empty=0)
-
-            for move in self.can_move_to((empty_y, empty_x)):
-                new_state = list(current_state)
-                self.move_to(new_state, move, empty=0)
-                new_state = tuple(new_state)
-                new_empty_tile = self.get_empty_tile_coordinates(new_state, empty=0)
-                new_path = path + [new_empty_tile]
+            parent_empty_i = came_from[current_state]
+            for new_empty_i in neighbors[empty_i]:
+                if new_empty_i == parent_empty_i:
+                    continue  # Undoing the last move leads back to the parent
+                new_state = slide(current_state, empty_i, new_empty_i)
                 new_cost = cost + 1
 
-                if new_state not in reached or new_cost < reached[new_state][2]:
-                    reached[new_state] = (new_state, new_path, new_cost)
-                    nodes_stored += 1  # Count this state as stored
-                    f = new_cost + self.heuristic(new_state, goal_state)
-                    heapq.heappush(
-                        frontier, (f, new_cost, (new_state, new_path, new_cost))
+                if new_state not in reached or new_cost < reached[new_state]:
+                    reached[new_state] = new_cost
+                    came_from[new_state] = empty_i
+                    # Only the slid tile's distance changes
+                    tile = tile_at(current_state, new_empty_i)
+                    new_h = update_h(
+                        h, current_state, new_state, tile, new_empty_i, empty_i
+                    )
+                    frontier.push(
+                        new_cost + weight * new_h,
+                        new_cost,
+                        new_state,
+                        new_empty_i,
+                        new_h,
                     )
 
+        return None, nodes_expanded, len(reached)  # If no solution is found
+
+    def parallel_a_star(self):
+        """Performs A* on several worker processes (hash-distributed A*).
+
+        Each state belongs to the worker picked by its hash, and workers send
+        each other the children they do not own in batches, see
+        parallel_search. The search ends once no worker has a node that could
+        lead to a shorter solution than the best one found, which is then
+        optimal. The path is rebuilt by asking each state's owner for its
+        parent. The heuristic must be given by name, so that every worker
+        can build its own.
+        """
+        if self.heuristic_name is not None and not isinstance(self.heuristic_name, str):
+            raise ValueError("Parallel A* needs a heuristic name")
+        slide = self.encoding.slide
+        search = parallel_search.ParallelSearch(
+            self.parallel_workers or os.cpu_count() or 1,
+            self.size,
+            self.encoding.decode(self.initial_state),
+            self.encoding.decode(self.encoding.goal),
+            self.heuristic_name,
+        )
+        self.start_progress()
+
+        try:
+            search.start()
+            while not search.finished():
+                self.check_deadline()
+                if self.observer is not None:
+                    nodes_expanded, open_size, stored, depth = search.totals()
+                    self.sample(
+                        nodes_expanded, open_size, stored, depth, search.solution_cost
+                    )
+
+            nodes_expanded, _, nodes_stored, _ = search.totals()
+            if search.solution_cost is None:
+                return None, nodes_expanded, nodes_stored  # If no solution is found
+
+            state = self.encoding.goal
+            empty_i = self.encoding.goal_blank
+            trace = [empty_i]
+            parent_empty_i = search.parent_of(state)
+            while parent_empty_i != -1:
+                state = slide(state, empty_i, parent_empty_i)
+                empty_i = parent_empty_i
+                trace.append(empty_i)
+                parent_empty_i = search.parent_of(state)
+        finally:
+            search.close()
+
+        return self.to_path(trace[::-1]), nodes_expanded, nodes_stored
+
+    def weighted_a_star(self):
+        """Performs weighted A* with ``self.weight``, see a_star."""
+        return self.a_star(self.weight)
+
+    def anytime_search(self):
+        """Anytime A* (ARA*), yielding a solution with a tighter bound every pass.
+
+        The first pass is weighted A* with ``self.anytime_weight``, so a solution is
+        found quickly. Each later pass lowers the weight by
+        ``self.weight_step`` and continues the previous search, re-expanding
+        only the states whose cost improved. Every pass that finds a shorter
+        path or tightens the bound yields ``(path, bound, nodes_expanded,
+        nodes_stored)``, where the path is proven at most ``bound`` times
+        longer than optimal. The last path,
+        with a bound of 1, is optimal. The generator raises SearchTimeout
+        once ``self.deadline`` has passed.
+        """
+        slide = self.encoding.slide
+        tile_at = self.encoding.tile_at
+        update_h = self.estimator.update
+        neighbors = self.neighbors
+        initial_state = self.initial_state
+        goal_state = self.encoding.goal
+        weight = max(self.anytime_weight, 1)
+
+        # (f, cost, state, empty_i, h) with f = cost + weight * h
+        h = self.heuristic(initial_state)
+        frontier = [(weight * h, 0, initial_state, self.initial_blank, h)]
+        reached = {initial_state: 0}
+        came_from = {initial_state: -1}
+        # States whose cost improved after they were expanded in this pass,
+        # mapped to (empty_i, h); they are expanded again in the next pass
+        inconsistent = {}
+
+        nodes_expanded = 0  # Counter for expanded nodes over all passes
+        nodes_stored = 1  # Start with the initial state counted as stored
+        last_solution = (math.inf, math.inf)  # (cost, bound) last yielded
+        self.start_progress()
+
+        while True:
+            closed = set()
+            # Expand until no open state can lead to a cheaper goal
+            while frontier and frontier[0][0] < reached.get(goal_state, math.inf):
+                f, cost, state, empty_i, h = heapq.heappop(frontier)
+                if cost > reached[state] or state in closed:
+                    continue  # Outdated entry, or already expanded in this pass
+
+                closed.add(state)
+                nodes_expanded += 1
+                if nodes_expanded % CHECK_INTERVAL == 0:
+                    self.check_deadline()
+                    if self.observer is not None:
+                        self.sample(
+                            nodes_expanded, len(frontier), len(reached), cost, f
+                        )
+
+                new_cost = cost + 1
+                parent_empty_i = came_from[state]
+                for new_empty_i in neighbors[empty_i]:
+                    if new_empty_i == parent_empty_i:
+                        continue  # Undoing the last move leads back to the parent
+                    new_state = slide(state, empty_i, new_empty_i)
+                    if new_cost >= reached.get(new_state, new_cost + 1):
+                        continue
+
+                    reached[new_state] = new_cost
+                    came_from[new_state] = empty_i
+                    nodes_stored += 1
+                    tile = tile_at(state, new_empty_i)
+                    new_h = update_h(h, state, new_state, tile, new_empty_i, empty_i)
+                    if new_state in closed:
+                        inconsistent[new_state] = (new_empty_i, new_h)
+                    else:
+                        heapq.heappush(
+                            frontier,
+                            (
+                                new_cost + weight * new_h,
+                                new_cost,
+                                new_state,
+                                new_empty_i,
+                                new_h,
+                            ),
+                        )
+
+            goal_cost = reached.get(goal_state)
+            if goal_cost is None:
+                return  # No solution exists
+
+            # The cheapest f over the states still to expand bounds the
+            # optimal cost from below, unless the solution found is cheaper
+            # (and so optimal)
+            open_states = {
+                state: (empty_i, h)
+                for _, cost, state, empty_i, h in frontier
+                if cost == reached[state] and state not in closed
+            }
+            open_states.update(inconsistent)
+            lower_bound = min(
+                (reached[state] + h for state, (_, h) in open_states.items()),
+                default=goal_cost,
+            )
+            lower_bound = min(lower_bound, goal_cost)
+            bound = min(weight, goal_cost / lower_bound) if lower_bound else 1
+
+            if goal_cost < last_solution[0] or bound < last_solution[1]:
+                last_solution = (goal_cost, bound)
+                trace = self.trace_back(came_from, goal_state, self.encoding.goal_blank)
+                yield self.to_path(trace[::-1]), bound, nodes_expanded, nodes_stored
+            if bound <= 1:
+                return
+
+            weight = max(weight - self.weight_step, 1)
+            frontier = [
+                (reached[state] + weight * h, reached[state], state, empty_i, h)
+                for state, (empty_i, h) in open_states.items()
+            ]
+            heapq.heapify(frontier)
+            inconsistent = {}
+
+    def anytime_a_star(self):
+        """Performs anytime A* until it proves its solution optimal or times out.
+
+        Returns the best solution found before ``self.deadline``, and only
+        raises SearchTimeout if there is none. The (moves, bound) of every
+        solution are recorded in ``self.anytime_solutions`` and passed on to
+        ``self.solution_observer`` with the path.
+        """
+        self.anytime_solutions = []
+        result = None, 0, 0
+        try:
+            for path, bound, nodes_expanded, nodes_stored in self.anytime_search():
+                self.anytime_solutions.append((len(path) - 1, bound))
+                result = path, nodes_expanded, nodes_stored
+                if self.solution_observer is not None:
+                    self.solution_observer(path, bound)
+        except SearchTimeout:
+            if result[0] is None:
+                raise
+        return result
+
+    def ida_star(self):
+        """Performs an iterative-deepening A* search to solve the puzzle.
+
+        Memory use is proportional to the solution depth: only the current
+        path is kept, and each iteration is a depth-first search bounded by
+        f = g + h. The nodes expanded in every iteration are recorded in
+        ``self.ida_iterations``. Moves completing a redundant move sequence
+        are skipped, since a shorter or equally short path avoids them.
+        """
+        slide = self.encoding.slide
+        tile_at = self.encoding.tile_at
+        update_h = self.estimator.update
+        goal_state = self.encoding.goal
+        moves = successors.move_table(self.size)
+        if self.prune_sequences:
+            automaton = successors.pruning_automaton()
+        else:
+            automaton = successors.pruning_automaton(2)  # Only undone moves
+        found = -1  # Sentinel returned by search() once the goal is reached
+
+        path = [self.initial_blank]
+        self.ida_iterations = []
+
+        nodes_expanded = 0  # Counter for expanded nodes over all iterations
+        nodes_stored = 1  # Deepest path held in memory at once
+        self.start_progress()
+
+        def search(state, empty_i, cost, h, bound, pruning_state):
+            """Bounded depth-first search, returning the smallest f over the bound."""
+            nonlocal nodes_expanded, nodes_stored
+
+            f = cost + h
+            if f > bound:
+                return f
+            if state == goal_state:
+                return found
+
+            nodes_expanded += 1
+            if nodes_expanded % CHECK_INTERVAL == 0:
+                self.check_deadline()
+                if self.observer is not None:
+                    self.sample(nodes_expanded, len(path), len(path), cost, bound)
+            nodes_stored = max(nodes_stored, len(path))
+            transitions = automaton[pruning_state]
+            minimum = float("inf")
+
+            for new_empty_i, direction in moves[empty_i]:
+                new_pruning_state = transitions[direction]
+                if new_pruning_state < 0:
+                    continue
+
+                tile = tile_at(state, new_empty_i)
+                new_state = slide(state, empty_i, new_empty_i)
+                path.append(new_empty_i)
+                result = search(
+                    new_state,
+                    new_empty_i,
+                    cost + 1,
+                    update_h(h, state, new_state, tile, new_empty_i, empty_i),
+                    bound,
+                    new_pruning_state,
+                )
+                if result == found:
+                    return found
+                path.pop()
+                minimum = min(minimum, result)
+
+            return minimum
+
+        h = self.heuristic(self.initial_state)
+        bound = h
+        while bound != float("inf"):
+            expanded_before = nodes_expanded
+            result = search(self.initial_state, self.initial_blank, 0, h, bound, 0)
+            self.ida_iterations.append((bound, nodes_expanded - expanded_before))
+
+            if result == found:
+                return self.to_path(path), nodes_expanded, nodes_stored
+            bound = result
+
         return None, nodes_expanded, nodes_stored  # If no solution is found
 
-    def get_empty_tile_coordinates(self, state: list, empty=None):
-        """Get the coordinates of the empty tile (represented by 0 or None)."""
-        empty_i = state.index(empty)
-        y = empty_i // self.size
-        x = empty_i % self.size
-        return (y, x)
-
-    def is_solved(self, state):
-        """Check if the puzzle is in the solved state."""
-        expected = list(range(1, self.size**2)) + [None]
-        return state == expected
-
-    def can_move_to(self, target: tuple) -> list[str]:
-        """Get a list of possible moves from the current empty tile position."""
-        target_y, target_x = target
-
-        moves: list[str] = []
-
-        if target_x > 0:
-            moves.append("l")
-        if target_x < self.size - 1:
-            moves.append("r")
-
-        if target_y > 0:
-            moves.append("u")
-        if target_y < self.size - 1:
-            moves.append("d")
-
-        return moves
-
-    def move_to(self, state: list, directions: str, empty=None):
-        """Move the empty tile in the specified direction."""
-        for direction in directions:
-            index = state.index(empty)
-            new_index = index
-
-            if direction == "l":
-                new_index = index - 1
-            elif direction == "r":
-                new_index = index + 1
-            elif direction == "u":
-                new_index = index - self.size
-            elif direction == "d":
-                new_index = index + self.size
-
-            state[index], state[new_index] = state[new_index], state[index]
-        return state
+    def table_lookup(self):
+        """Solves a 3x3 puzzle optimally from the precomputed distance table.
+
+        Every move goes to the neighbor one step closer to the goal, so no
+        search is needed. The table is memory-mapped (and built on first use).
+        """
+        if self.size != distance_table.SIZE or not self.encoding.is_standard_goal:
+            raise ValueError("The distance table covers 3x3 boards with the usual goal")
+
+        positions = [0] * self.encoding.cells
+        for cell in range(self.encoding.cells):
+            positions[self.encoding.tile_at(self.initial_state, cell)] = cell
+
+        trace = distance_table.shared_table().descend(positions)
+        if trace is None:
+            return None, 0, 0  # If no solution is found
+        return self.to_path(trace), len(trace) - 1, len(trace)
+
+    def constructive(self):
+        """Solves a board of any size in a fraction of a second, not optimally.
+
+        Tiles are put into place row by row and column by column, and only
+        the last 2x3 (or smaller) region is searched; see ConstructiveSolver.
+        """
+        if not self.encoding.is_standard_goal:
+            raise ValueError("The constructive solver only reaches the usual goal")
+
+        solver = constructive_solver.ConstructiveSolver(
+            self.size, self.size, self.encoding.decode(self.initial_state)
+        )
+        try:
+            path = self.to_path(solver.solve())
+        except ValueError:
+            return None, solver.nodes_expanded, solver.nodes_stored
+        return path, solver.nodes_expanded, solver.nodes_stored
+
+    def trace_back(self, came_from, state, empty_i):
+        """Follow parent links from a state back to the root of its search.
+
+        ``came_from`` maps each state to the empty tile index of the state it
+        was generated from (-1 for the root). Returns the empty tile indices
+        from ``state`` back to the root, both included.
+        """
+        slide = self.encoding.slide
+        trace = [empty_i]
+        parent_empty_i = came_from[state]
+
+        while parent_empty_i != -1:
+            state = slide(state, empty_i, parent_empty_i)
+            empty_i = parent_empty_i
+            trace.append(empty_i)
+            parent_empty_i = came_from[state]
+
+        return trace
+
+    def to_path(self, empty_indices):
+        """Convert empty tile indices to the (y, x) moves expected by the GUI."""
+        return [divmod(empty_i, self.size) for empty_i in empty_indices]
+
+
+# Algorithms accepted by solve(), by display name and by method name
+SOLVERS = {
+    "BFS": "bfs",
+    "Vectorized BFS": "vectorized_bfs",
+    "External BFS": "external_bfs",
+    "Bidirectional": "bidirectional",
+    "Bidirectional MM": "bidirectional_mm",
+    "A*": "a_star",
+    "Parallel A*": "parallel_a_star",
+    "Weighted A*": "weighted_a_star",
+    "Anytime A*": "anytime_a_star",
+    "IDA*": "ida_star",
+    "Distance Table": "table_lookup",
+    "Constructive": "constructive",
+}
+
+# Solvers that use a heuristic, and solvers whose paths are always shortest
+INFORMED_SOLVERS = {
+    "bidirectional_mm",
+    "a_star",
+    "parallel_a_star",
+    "weighted_a_star",
+    "anytime_a_star",
+    "ida_star",
+}
+OPTIMAL_SOLVERS = {
+    "bfs",
+    "vectorized_bfs",
+    "external_bfs",
+    "bidirectional",
+    "bidirectional_mm",
+    "a_star",
+    "parallel_a_star",
+    "ida_star",
+    "table_lookup",
+}
+# Solvers whose paths depend on the weight (and time limit) they were given
+BOUNDED_SOLVERS = {"weighted_a_star", "anytime_a_star"}
+# Solvers that start worker processes of their own
+PROCESS_SOLVERS = {"parallel_a_star"}
+
+
+def parse_board(board, size=None):
+    """Validate a flat or 2-D board and return ``(size, flat_tiles)``.
+
+    The empty tile may be given as None or 0; it is returned as None.
+    """
+    if board and isinstance(board[0], (list, tuple)):
+        if any(len(row) != len(board) for row in board):
+            raise ValueError("A 2-D board must be square")
+        flat_tiles = [tile for row in board for tile in row]
+    else:
+        flat_tiles = list(board)
+
+    board_size = math.isqrt(len(flat_tiles))
+    if board_size < 2 or board_size**2 != len(flat_tiles):
+        raise ValueError(f"A board of {len(flat_tiles)} tiles is not square")
+    if size is not None and board_size != size:
+        raise ValueError(
+            f"Expected a {size}x{size} board, got {board_size}x{board_size}"
+        )
+
+    flat_tiles = [tile or None for tile in flat_tiles]
+    if sorted(flat_tiles, key=lambda tile: tile or 0) != [None] + list(
+        range(1, len(flat_tiles))
+    ):
+        raise ValueError(
+            f"Board must hold the tiles 1 to {len(flat_tiles) - 1} and one empty tile"
+        )
+    return board_size, flat_tiles
+
+
+def is_solvable(size, flat_tiles, goal_tiles):
+    """Check in O(n^2) whether ``goal_tiles`` can be reached from ``flat_tiles``.
+
+    Every move is a transposition with the empty tile, so the parity of the
+    permutation between the two boards has to match the parity of the empty
+    tile's taxicab distance between them. This covers the usual inversion and
+    blank-row rules for odd and even widths alike.
+    """
+    goal_cells = {tile: cell for cell, tile in enumerate(goal_tiles)}
+    permutation = [goal_cells[tile] for tile in flat_tiles]
+
+    # A cycle of length k takes k - 1 transpositions
+    transpositions = 0
+    seen = [False] * len(permutation)
+    for start in range(len(permutation)):
+        length = 0
+        cell = start
+        while not seen[cell]:
+            seen[cell] = True
+            cell = permutation[cell]
+            length += 1
+        transpositions += max(length - 1, 0)
+
+    blank_y, blank_x = divmod(flat_tiles.index(None), size)
+    goal_y, goal_x = divmod(goal_tiles.index(None), size)
+    blank_distance = abs(blank_y - goal_y) + abs(blank_x - goal_x)
+    return transpositions % 2 == blank_distance % 2
+
+
+def solve(
+    board,
+    algorithm="A*",
+    heuristic=None,
+    goal=None,
+    time_limit=None,
+    cache=None,
+    weight=None,
+):
+    """Solve any board without the GUI.
+
+    ``board`` and ``goal`` may be flat or 2-D, with None or 0 as the empty
+    tile; the goal defaults to the tiles in order with the empty tile last.
+    ``algorithm`` is a key or value of SOLVERS and ``heuristic`` is passed on
+    to PuzzleAlgorithms. Unsolvable boards are rejected before any search,
+    and searches running longer than ``time_limit`` seconds raise
+    SearchTimeout. With a SolutionCache as ``cache``, cached boards are
+    answered without a search (reporting 0 nodes) and new solutions are added.
+    ``weight`` sets the heuristic weight of weighted A* and of the first pass
+    of anytime A*; anytime A* returns its best solution once ``time_limit`` is reached.
+
+    Returns ``(moves, nodes_expanded, nodes_stored)``, where ``moves`` lists
+    the (y, x) cell of the tile slid into the empty space at every step.
+    """
+    size, flat_tiles = parse_board(board)
+    if goal is None:
+        goal_tiles = list(range(1, size**2)) + [None]
+    else:
+        goal_tiles = parse_board(goal, size)[1]
+
+    if algorithm in SOLVERS:
+        algorithm = SOLVERS[algorithm]
+    elif algorithm not in SOLVERS.values():
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+
+    if not is_solvable(size, flat_tiles, goal_tiles):
+        raise UnsolvablePuzzleError("The goal cannot be reached from this board")
+
+    if cache is not None:
+        path = cache.get(size, flat_tiles, goal_tiles, algorithm, heuristic)
+        if path is not None:
+            return path, 0, 0
+
+    tiles = [flat_tiles[i : i + size] for i in range(0, size**2, size)]
+    goal = [goal_tiles[i : i + size] for i in range(0, size**2, size)]
+    empty_tile = divmod(flat_tiles.index(None), size)
+    alg = PuzzleAlgorithms(size, tiles, empty_tile, heuristic, goal)
+    if time_limit is not None:
+        alg.deadline = time.monotonic() + time_limit
+    if weight is not None:
+        alg.weight = alg.anytime_weight = weight
+
+    path, nodes_expanded, nodes_stored = getattr(alg, algorithm)()
+    # Searches that include the starting empty tile in their path
+    if path and path[0] == empty_tile:
+        path = path[1:]
+    if cache is not None:
+        cache.put(size, flat_tiles, goal_tiles, algorithm, heuristic, path)
+    return path, nodes_expanded, nodes_stored
@@ -0,0 +1,242 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from algorithms import SearchTimeout, UnsolvablePuzzleError, parse_board, solve
+from parallel_search import SearchWorkerError
+from solution_cache import SolutionCache
+
+# Times a puzzle is submitted before a dying worker process is reported as
+# its error
+MAX_ATTEMPTS = 3
+
+
+def solve_line(line_number, line, defaults):
+    """Solve one JSONL puzzle line and return its result record.
+
+    A line is an object with a ``board`` and optionally an ``id``, ``goal``,
+    ``algorithm``, ``heuristic`` and ``weight``; missing options come from
+    ``defaults``. Failures are reported in an ``error`` field instead of being
+    raised, so one bad line never stops the batch.
+    """
+    result = {"id": line_number}
+    start_time = time.perf_counter()
+    try:
+        puzzle = json.loads(line)
+        result["id"] = puzzle.get("id", line_number)
+        path, nodes_expanded, nodes_stored = solve(
+            puzzle["board"],
+            algorithm=puzzle.get("algorithm", defaults["algorithm"]),
+            heuristic=puzzle.get("heuristic", defaults["heuristic"]),
+            goal=puzzle.get("goal"),
+            time_limit=defaults["timeout"],
+            weight=puzzle.get("weight", defaults["weight"]),
+        )
+    except (SearchTimeout, UnsolvablePuzzleError, SearchWorkerError) as error:
+        result["error"] = str(error)
+    except MemoryError:
+        result["error"] = "Search ran out of memory"
+    except (ValueError, KeyError, TypeError, AttributeError) as error:
+        result["error"] = f"Invalid puzzle: {error}"
+    else:
+        result["path"] = path
+        result["moves"] = len(path)
+        result["nodes_expanded"] = nodes_expanded
+        result["nodes_stored"] = nodes_stored
+    result["time"] = round(time.perf_counter() - start_time, 6)
+    return result
+
+
+def line_id(line_number, line):
+    """The ``id`` of a puzzle line, or its line number if it has none."""
+    try:
+        return json.loads(line).get("id", line_number)
+    except (ValueError, AttributeError):
+        return line_number
+
+
+def cache_request(line, defaults):
+    """Parse a puzzle line into SolutionCache arguments, or None if it is invalid."""
+    try:
+        puzzle = json.loads(line)
+        size, flat_tiles = parse_board(puzzle["board"])
+        goal_tiles = None
+        if puzzle.get("goal") is not None:
+            goal_tiles = parse_board(puzzle["goal"], size)[1]
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None  # The worker reports the error
+    return (
+        puzzle.get("id"),
+        (
+            size,
+            flat_tiles,
+            goal_tiles,
+            puzzle.get("algorithm", defaults["algorithm"]),
+            puzzle.get("heuristic", defaults["heuristic"]),
+        ),
+    )
+
+
+def run_batch(lines, output, defaults, workers=None, max_in_flight=None, cache=None):
+    """Solve puzzles from an iterable of JSONL lines on a process pool.
+
+    At most ``max_in_flight`` puzzles are submitted but unfinished at any
+    time, so memory stays flat however long the input is. Each result is
+    written and flushed as soon as its puzzle finishes, so results come out
+    in completion order rather than input order. With a SolutionCache, cached
+    puzzles are answered right away and new solutions are added to it.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = set()
+    # Line number, line, attempts so far and submission time of every pending
+    # future, and the cache arguments of those that have them
+    puzzles = {}
+    requests = {}
+
+    def submit(line_number, line, attempts=0, request=None):
+        nonlocal executor
+        try:
+            future = executor.submit(solve_line, line_number, line, defaults)
+        except BrokenProcessPool:
+            # A worker died, e.g. killed by the OS for using too much memory
+            executor.shutdown()
+            executor = ProcessPoolExecutor(max_workers=workers)
+            future = executor.submit(solve_line, line_number, line, defaults)
+        puzzles[future] = (line_number, line, attempts + 1, time.perf_counter())
+        if request is not None:
+            requests[future] = request
+        pending.add(future)
+
+    def write_finished(done):
+        for future in done:
+            pending.discard(future)
+            line_number, line, attempts, submit_time = puzzles.pop(future)
+            request = requests.pop(future, None)
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                # Every puzzle in flight fails with the pool, not only the one
+                # whose worker died, so they get another chance on a new pool
+                if attempts < MAX_ATTEMPTS:
+                    submit(line_number, line, attempts, request)
+                    continue
+                result = {
+                    "id": line_id(line_number, line),
+                    "error": f"Worker process died {attempts} times",
+                    "time": round(time.perf_counter() - submit_time, 6),
+                }
+            if request is not None and "path" in result:
+                cache.put(*request, result["path"])
+            output.write(json.dumps(result) + "\n")
+        output.flush()
+
+    try:
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            request = None
+            if cache is not None:
+                start_time = time.perf_counter()
+                parsed = cache_request(line, defaults)
+                if parsed is not None:
+                    puzzle_id, request = parsed
+                    path = cache.get(*request)
+                    if path is not None:
+                        result = {"id": line_number if puzzle_id is None else puzzle_id}
+                        result.update(
+                            path=path,
+                            moves=len(path),
+                            nodes_expanded=0,
+                            nodes_stored=0,
+                            time=round(time.perf_counter() - start_time, 6),
+                            cached=True,
+                        )
+                        output.write(json.dumps(result) + "\n")
+                        output.flush()
+                        continue
+
+            while len(pending) >= max_in_flight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                write_finished(done)
+            submit(line_number, line, request=request)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            write_finished(done)
+    finally:
+        executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Solve sliding puzzles from a JSONL file on all CPU cores."
+    )
+    parser.add_argument(
+        "input", nargs="?", default="-", help="JSONL file of puzzles (default: stdin)"
+    )
+    parser.add_argument(
+        "-o", "--output", default="-", help="JSONL file for results (default: stdout)"
+    )
+    parser.add_argument("--algorithm", default="A*")
+    parser.add_argument("--heuristic", default="Manhattan")
+    parser.add_argument(
+        "--weight",
+        type=float,
+        default=None,
+        help="heuristic weight of (anytime) weighted A*",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=None, help="seconds allowed per puzzle"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--cache", help="JSON file of cached solutions, read at start and saved at end"
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=100000, help="maximum cache entries"
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=None,
+        help="puzzles queued at once (default: 4 per worker)",
+    )
+    args = parser.parse_args()
+
+    defaults = {
+        "algorithm": args.algorithm,
+        "heuristic": args.heuristic,
+        "weight": args.weight,
+        "timeout": args.timeout,
+    }
+    input_file = sys.stdin if args.input == "-" else open(args.input)
+    output_file = sys.stdout if args.output == "-" else open(args.output, "w")
+    cache = None
+    if args.cache:
+        cache = SolutionCache(args.cache_size, args.cache)
+    try:
+        run_batch(
+            input_file,
+            output_file,
+            defaults,
+            args.workers,
+            args.max_in_flight,
+            cache,
+        )
+        if cache is not None:
+            cache.save()
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+if __name__ == "__main__":
+    main()
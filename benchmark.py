@@ -0,0 +1,299 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import platform
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithm_worker import measure_algorithm
+from algorithms import INFORMED_SOLVERS, SOLVERS
+from scramble import board_at_distance
+
+# Algorithms that are benchmarked once per heuristic
+INFORMED_ALGORITHMS = [
+    name for name, method in SOLVERS.items() if method in INFORMED_SOLVERS
+]
+
+# Metrics compared against a baseline, lower is better for all of them
+COMPARED_METRICS = ["wall_time", "cpu_time", "nodes_expanded", "peak_rss"]
+
+CSV_FIELDS = [
+    "size",
+    "depth",
+    "instance",
+    "algorithm",
+    "heuristic",
+    "moves",
+    "nodes_expanded",
+    "nodes_stored",
+    "wall_time",
+    "cpu_time",
+    "nodes_per_second",
+    "peak_rss",
+    "error",
+]
+
+
+def generate_instances(size, depths, per_depth, seed):
+    """Generate ``per_depth`` boards for every optimal solution depth in ``depths``.
+
+    Boards come from scramble.board_at_distance with a seeded generator, so
+    the same arguments always give the same set.
+    """
+    rng = random.Random(f"{seed}:{size}")
+    return [
+        {"size": size, "depth": depth, "board": board_at_distance(size, depth, rng)}
+        for depth in sorted(depths)
+        for _ in range(per_depth)
+    ]
+
+
+def benchmark(instances, algorithms, heuristics, time_limit=None, workers=1):
+    """Run every algorithm on every instance and return one record per run.
+
+    Every run gets a fresh worker process so its peak RSS is its own. Keep
+    ``workers`` at 1 for the most stable timings.
+    """
+    jobs = []
+    for index, instance in enumerate(instances):
+        size = instance["size"]
+        board = instance["board"]
+        tiles = [
+            [tile or None for tile in board[i : i + size]]
+            for i in range(0, size**2, size)
+        ]
+        empty_tile = divmod([tile or 0 for tile in board].index(0), size)
+        for algorithm in algorithms:
+            run_heuristics = (
+                heuristics if algorithm in INFORMED_ALGORITHMS else ["Manhattan"]
+            )
+            for heuristic in run_heuristics:
+                jobs.append(
+                    (index, instance, (algorithm, heuristic, size, tiles, empty_tile))
+                )
+
+    records = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as executor:
+        futures = [
+            (index, instance, executor.submit(measure_algorithm, *args, time_limit))
+            for index, instance, args in jobs
+        ]
+        for index, instance, future in futures:
+            result = future.result()
+            record = {
+                "size": instance["size"],
+                "depth": instance["depth"],
+                "instance": index,
+                "algorithm": result["algorithm"],
+                "heuristic": result["heuristic"],
+                "wall_time": result["wall_time"],
+                "cpu_time": result["cpu_time"],
+                "peak_rss": result["peak_rss"],
+                "error": result.get("error"),
+            }
+            if "path" in result and result["path"] is not None:
+                record["moves"] = len(result["path"])
+                record["nodes_expanded"] = result["nodes_expanded"]
+                record["nodes_stored"] = result["nodes_stored"]
+                record["nodes_per_second"] = result["nodes_expanded"] / max(
+                    result["wall_time"], 1e-9
+                )
+            records.append(record)
+            print(
+                f"{record['size']}x{record['size']} depth {record['depth']:>2} "
+                f"#{index:<3} {record['algorithm']:<13} {record['heuristic']:<17} "
+                f"{record['wall_time']:8.4f}s {record.get('nodes_expanded', '-'):>10} "
+                f"{record['error'] or ''}",
+                file=sys.stderr,
+            )
+    return records
+
+
+def save_results(path, instances, records, settings):
+    """Write the instances, settings and records as JSON."""
+    with open(path, "w") as results_file:
+        json.dump(
+            {
+                "settings": settings,
+                "environment": {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                },
+                "instances": instances,
+                "results": records,
+            },
+            results_file,
+            indent=1,
+        )
+
+
+def save_csv(path, records):
+    """Write the records as CSV, one row per run."""
+    with open(path, "w", newline="") as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow({field: record.get(field) for field in CSV_FIELDS})
+
+
+def summarize(records):
+    """Median of every compared metric per (size, depth, algorithm, heuristic)."""
+    groups = {}
+    for record in records:
+        key = (
+            record["size"],
+            record["depth"],
+            record["algorithm"],
+            record["heuristic"],
+        )
+        groups.setdefault(key, []).append(record)
+
+    summary = {}
+    for key, group in groups.items():
+        summary[key] = {"errors": sum(1 for record in group if record["error"])}
+        for metric in COMPARED_METRICS:
+            values = [
+                record[metric] for record in group if record.get(metric) is not None
+            ]
+            summary[key][metric] = statistics.median(values) if values else None
+    return summary
+
+
+def compare(baseline_records, current_records, threshold, min_time_delta=0.005):
+    """List the regressions of ``current_records`` against ``baseline_records``.
+
+    A metric regresses when its median grows by more than ``threshold``
+    (a fraction); a group also regresses when it has more failed runs.
+    Timings that grow by less than ``min_time_delta`` seconds are treated as
+    noise.
+    """
+    baseline = summarize(baseline_records)
+    current = summarize(current_records)
+    regressions = []
+
+    for key, current_summary in sorted(current.items()):
+        if key not in baseline:
+            continue
+        baseline_summary = baseline[key]
+        if current_summary["errors"] > baseline_summary["errors"]:
+            regressions.append(
+                (key, "errors", baseline_summary["errors"], current_summary["errors"])
+            )
+        for metric in COMPARED_METRICS:
+            old = baseline_summary[metric]
+            new = current_summary[metric]
+            if old is None or new is None:
+                continue
+            if metric in ("wall_time", "cpu_time") and new - old < min_time_delta:
+                continue
+            if new > old * (1 + threshold):
+                regressions.append((key, metric, old, new))
+    return regressions
+
+
+def parse_depths(text):
+    """Parse depths such as '8,16,24' or '10-14'."""
+    depths = []
+    for part in text.split(","):
+        if "-" in part:
+            low, high = part.split("-")
+            depths.extend(range(int(low), int(high) + 1))
+        else:
+            depths.append(int(part))
+    return depths
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the sliding puzzle algorithms."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmark")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[3])
+    run_parser.add_argument(
+        "--depths",
+        type=parse_depths,
+        default=[8, 16, 24],
+        help="optimal solution depths, e.g. '8,16,24' or '10-14'",
+    )
+    run_parser.add_argument("--per-depth", type=int, default=5)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument(
+        "--algorithms", nargs="+", default=list(SOLVERS), choices=list(SOLVERS)
+    )
+    run_parser.add_argument("--heuristics", nargs="+", default=["Manhattan"])
+    run_parser.add_argument(
+        "--time-limit", type=float, default=60, help="seconds allowed per run"
+    )
+    run_parser.add_argument("--workers", type=int, default=1)
+    run_parser.add_argument("--output", default="benchmark.json")
+    run_parser.add_argument("--csv", help="also write the results as CSV")
+
+    compare_parser = commands.add_parser(
+        "compare", help="flag regressions against a baseline"
+    )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed relative increase of a median (default: 0.1)",
+    )
+    compare_parser.add_argument(
+        "--min-time-delta",
+        type=float,
+        default=0.005,
+        help="ignore timing increases below this many seconds (default: 0.005)",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        instances = []
+        for size in args.sizes:
+            instances.extend(
+                generate_instances(size, args.depths, args.per_depth, args.seed)
+            )
+        records = benchmark(
+            instances, args.algorithms, args.heuristics, args.time_limit, args.workers
+        )
+        settings = {
+            key: getattr(args, key)
+            for key in ("sizes", "depths", "per_depth", "seed", "time_limit")
+        }
+        save_results(args.output, instances, records, settings)
+        if args.csv:
+            save_csv(args.csv, records)
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        baseline_records = json.load(baseline_file)["results"]
+    with open(args.current) as current_file:
+        current_records = json.load(current_file)["results"]
+
+    regressions = compare(
+        baseline_records, current_records, args.threshold, args.min_time_delta
+    )
+    for (size, depth, algorithm, heuristic), metric, old, new in regressions:
+        print(
+            f"REGRESSION {size}x{size} depth {depth} {algorithm} ({heuristic}) "
+            f"{metric}: {old:.6g} -> {new:.6g}"
+        )
+    if not regressions:
+        print("No regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
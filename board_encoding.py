@@ -0,0 +1,72 @@
+class BoardEncoding:
+    """Compact integer encoding of puzzle boards.
+
+    Every cell of the flattened board gets a fixed-width bit field inside a
+    single Python int, cell ``i`` occupying bits ``i * bits`` and up. Boards
+    up to 4x4 use 4 bits per tile (a 15-puzzle fits in 64 bits); larger boards
+    use the smallest width that can hold their largest tile number. The empty
+    tile is stored as 0, so sliding a tile only touches two fields.
+
+    The goal defaults to the tiles in order with the empty tile last, but any
+    flat goal layout can be given.
+    """
+
+    def __init__(self, size, goal_tiles=None):
+        self.size = size
+        self.cells = size**2
+        self.bits = max(4, (self.cells - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+
+        if goal_tiles is None:
+            goal_tiles = list(range(1, self.cells)) + [None]
+        self.goal = self.encode(goal_tiles)
+        self.goal_blank = self.blank_index(self.goal)
+        # goal_cells[tile] is the goal index of a tile, goal_cells[0] the blank's
+        self.goal_cells = [0] * self.cells
+        for cell, tile in enumerate(goal_tiles):
+            self.goal_cells[tile or 0] = cell
+
+    @property
+    def is_standard_goal(self):
+        """Whether the goal is the tiles in order with the empty tile last."""
+        return self.goal == self.encode(list(range(1, self.cells)) + [None])
+
+    def encode(self, flat_tiles):
+        """Pack a flat list of tiles (None or 0 for the empty tile) into an int."""
+        state = 0
+        bits = self.bits
+        for i, tile in enumerate(flat_tiles):
+            if tile:
+                state |= tile << (i * bits)
+        return state
+
+    def encode_tiles(self, tiles):
+        """Pack the GUI's 2-D tile grid and return ``(state, blank_index)``."""
+        flat_tiles = [tile for row in tiles for tile in row]
+        blank = next(i for i, tile in enumerate(flat_tiles) if not tile)
+        return self.encode(flat_tiles), blank
+
+    def decode(self, state):
+        """Unpack a state into a flat list of tiles with None for the empty tile."""
+        bits = self.bits
+        mask = self.mask
+        return [(state >> (i * bits)) & mask or None for i in range(self.cells)]
+
+    def tile_at(self, state, index):
+        """Get the tile number stored at a flat index (0 for the empty tile)."""
+        return (state >> (index * self.bits)) & self.mask
+
+    def blank_index(self, state):
+        """Find the flat index of the empty tile."""
+        bits = self.bits
+        mask = self.mask
+        for i in range(self.cells):
+            if not (state >> (i * bits)) & mask:
+                return i
+        raise ValueError("State has no empty tile")
+
+    def slide(self, state, blank, target):
+        """Slide the tile at ``target`` into the empty cell at ``blank``."""
+        target_shift = target * self.bits
+        tile = (state >> target_shift) & self.mask
+        return state - (tile << target_shift) + (tile << (blank * self.bits))
@@ -1,66 +1,202 @@
-import random
+import multiprocessing
+import queue
 import sys
 import time
-import threading
-from PyQt5.QtCore import pyqtSignal, QObject
+from PyQt5.QtCore import pyqtSignal, QObject, QTimer
 from PyQt5.QtWidgets import (
     QApplication,
-    QGridLayout,
+    QLabel,
     QMessageBox,
+    QProgressBar,
     QPushButton,
+    QSpinBox,
     QVBoxLayout,
     QWidget,
 )
 
-from algorithms import PuzzleAlgorithms
+from algorithm_worker import run_algorithm
+from algorithms import INFORMED_SOLVERS, PROCESS_SOLVERS, SOLVERS
 from checkable_combo_box import CheckableComboBox
+from heuristics import HEURISTICS
+from puzzle_board import PuzzleBoard
+from scramble import random_board
 
 
-ALGORITHMS = ["BFS", "Bidirectional", "A*"]
+ALGORITHMS = list(SOLVERS)
 
+# Algorithms that are run once per selected heuristic
+INFORMED_ALGORITHMS = [
+    name for name, method in SOLVERS.items() if method in INFORMED_SOLVERS
+]
 
-class AlgorithmRunner(QObject):
-    finished = pyqtSignal(str, str, int, int)
+# Worker processes are spawned rather than forked from the running Qt app
+PROCESS_CONTEXT = multiprocessing.get_context("spawn")
 
-    def __init__(self, algorithm, size, tiles, empty_tile):
-        super().__init__()
-        self.algorithm = algorithm
-        self.size = size
-        self.tiles = tiles
-        self.empty_tile = empty_tile
+POLL_INTERVAL = 50  # Milliseconds between checks for worker results
+KILL_GRACE_PERIOD = 2  # Seconds a worker may overrun its time limit
+
+
+def format_progress(name, metrics):
+    """Format the progress metrics of PuzzleAlgorithms.sample for display."""
+    text = (
+        f"{name}: {metrics['nodes_expanded']:,} expanded, "
+        f"{metrics['expansions_per_second']:,.0f}/s, "
+        f"open {metrics['open']:,}, stored {metrics['stored']:,}, "
+        f"depth {metrics['depth']}"
+    )
+    if metrics["bound"] is not None:
+        text += f", bound {metrics['bound']:g}"
+    return text + f", ~{metrics['memory'] / 2**20:.1f} MB"
 
-    def run(self):
-        """Run the selected algorithm and emit the statistics."""
-        alg = PuzzleAlgorithms(self.size, self.tiles, self.empty_tile)
 
-        nodes_expanded = 0
-        nodes_stored = 0
+def format_statistics(result):
+    """Format the result dict of algorithm_worker.run_algorithm for display."""
+    statistics = f"    Time: {result['wall_time']:.4f}s\n"
+    statistics += f"    CPU Time: {result['cpu_time']:.4f}s\n"
 
-        start_time = time.time()
+    if "error" in result:
+        return statistics + f"    Error: {result['error']}\n"
+    if result["path"] is None:
+        return statistics + "    No solution found\n"
 
-        if self.algorithm == "BFS":
-            path, nodes_expanded, nodes_stored = alg.bfs()
-        elif self.algorithm == "Bidirectional":
-            path, nodes_expanded, nodes_stored = alg.bidirectional()
-        elif self.algorithm == "A*":
-            path, nodes_expanded, nodes_stored = alg.a_star()
+    statistics += f"    Nodes Expanded: {result['nodes_expanded']}\n"
+    statistics += f"    Nodes Stored: {result['nodes_stored']}\n"
+    statistics += f"    moves: {len(result['path'])}\n"
 
-        end_time = time.time()
+    if result["algorithm"] == "IDA*":
+        statistics += f"    Iterations: {len(result['ida_iterations'])}\n"
+        for bound, expanded in result["ida_iterations"]:
+            statistics += f"        Bound {bound}: {expanded} expanded\n"
 
-        if self.algorithm == "BFS":
-            moves = len(path)
-        elif self.algorithm == "Bidirectional" or self.algorithm == "A*":
-            moves = len(path) - 1
+    if result["algorithm"] == "Anytime A*":
+        statistics += f"    Solutions: {len(result['anytime_solutions'])}\n"
+        for moves, bound in result["anytime_solutions"]:
+            statistics += f"        {moves} moves: at most {bound:.2f}x optimal\n"
 
-        execution_time = end_time - start_time
+    return statistics
 
-        statistics = f"    Time: {execution_time:.4f}s\n"
-        statistics += f"    Nodes Expanded: {nodes_expanded}\n"
-        statistics += f"    Nodes Stored: {nodes_stored}\n"
-        statistics += f"    moves: {moves}\n"
+
+class AlgorithmRunner(QObject):
+    """Runs one algorithm in a worker process and reports back on the GUI thread."""
+
+    finished = pyqtSignal(str, str, int, int)
+    progress = pyqtSignal(dict)  # Metrics sampled by the running search
+    solution_found = pyqtSignal(list, float)  # Path and bound from Anytime A*
+    result_ready = pyqtSignal(dict)  # Full result dict of algorithm_worker
+
+    def __init__(
+        self,
+        algorithm,
+        size,
+        tiles,
+        empty_tile,
+        heuristic="Manhattan",
+        time_limit=None,
+        memory_limit=None,
+    ):
+        super().__init__()
+        self.algorithm = algorithm
+        self.size = size
+        self.tiles = tiles
+        self.empty_tile = empty_tile
+        self.heuristic = heuristic
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+
+        self.process = None
+        self.result_queue = None
+        self.start_time = None
+        self.poll_timer = QTimer()
+        self.poll_timer.timeout.connect(self.poll)
+
+    def run(self):
+        """Start the selected algorithm in a worker process."""
+        self.result_queue = PROCESS_CONTEXT.Queue()
+        self.process = PROCESS_CONTEXT.Process(
+            target=run_algorithm,
+            args=(
+                self.algorithm,
+                self.heuristic,
+                self.size,
+                self.tiles,
+                self.empty_tile,
+                self.result_queue,
+                self.time_limit,
+                self.memory_limit,
+            ),
+            # Daemonic processes cannot start the workers of Parallel A*
+            daemon=SOLVERS[self.algorithm] not in PROCESS_SOLVERS,
+        )
+        self.process.start()
+        self.start_time = time.monotonic()
+        self.poll_timer.start(POLL_INTERVAL)
+
+    def poll(self):
+        """Check the worker process for progress reports and its result."""
+        if self.drain(lambda: self.result_queue.get(timeout=0.001)):
+            return
+
+        elapsed = time.monotonic() - self.start_time
+        if not self.process.is_alive():
+            # The worker may have put its result just before exiting
+            if self.drain(self.result_queue.get_nowait):
+                return
+            # A worker killed by the system (e.g. out of memory) never reports
+            self.stop({"error": f"Worker exited with code {self.process.exitcode}"})
+        elif self.time_limit and elapsed > self.time_limit + KILL_GRACE_PERIOD:
+            self.stop({"error": "Time limit exceeded"})
+
+    def drain(self, get):
+        """Handle the queued worker messages; return True if the result was one.
+
+        ``get`` takes the next message from the queue, raising queue.Empty
+        when there is none.
+        """
+        while True:
+            try:
+                kind, data = get()
+            except queue.Empty:
+                return False
+            if kind == "result":
+                self.stop(data)
+                return True
+            if kind == "solution":
+                self.solution_found.emit(*data)
+            else:
+                self.progress.emit(data)
+
+    def cancel(self):
+        """Stop the worker process if it is still running."""
+        if self.poll_timer.isActive():
+            self.stop({"error": "Cancelled"})
+
+    def stop(self, result):
+        """Shut the worker down and emit the statistics."""
+        self.poll_timer.stop()
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+
+        # Results from the worker carry their own timings
+        elapsed = time.monotonic() - self.start_time
+        result.setdefault("algorithm", self.algorithm)
+        result.setdefault("wall_time", elapsed)
+        result.setdefault("cpu_time", 0.0)
 
         # Emit the finished signal with the algorithm name and statistics data
-        self.finished.emit(self.algorithm, statistics, nodes_expanded, nodes_stored)
+        self.finished.emit(
+            self.name(),
+            format_statistics(result),
+            result.get("nodes_expanded", 0),
+            result.get("nodes_stored", 0),
+        )
+        self.result_ready.emit(result)
+
+    def name(self):
+        """Display name of the algorithm, with its heuristic if it uses one."""
+        if self.algorithm in INFORMED_ALGORITHMS:
+            return f"{self.algorithm} ({self.heuristic})"
+        return self.algorithm
 
 
 class SlidingPuzzleComparison(QWidget):
@@ -69,6 +205,8 @@ class SlidingPuzzleComparison(QWidget):
     def __init__(self, size: int):
         super().__init__()
         self.results = []  # List to hold the results of each algorithm comparison
+        self.runs = []  # (algorithm, heuristic) pairs of the current comparison
+        self.runners = []  # AlgorithmRunners of the current comparison
 
         self.setWindowTitle("Sliding Puzzle - Comparison Mode")
 
@@ -78,17 +216,50 @@ class SlidingPuzzleComparison(QWidget):
 
         self.layout = QVBoxLayout()
 
-        self.puzzle_frame = QGridLayout()
-        self.layout.addLayout(self.puzzle_frame)
+        self.board = PuzzleBoard(self.size)
+        self.layout.addWidget(self.board)
 
         self.algorithm_selector = CheckableComboBox()
         self.algorithm_selector.addItems(ALGORITHMS)
         self.layout.addWidget(self.algorithm_selector)
 
+        # Heuristics to compare for the informed algorithms
+        self.heuristic_selector = CheckableComboBox()
+        self.heuristic_selector.addItems(list(HEURISTICS))
+        self.layout.addWidget(self.heuristic_selector)
+
+        # Limits per algorithm, 0 means unlimited
+        self.time_limit_selector = QSpinBox()
+        self.time_limit_selector.setRange(0, 3600)
+        self.time_limit_selector.setValue(60)
+        self.time_limit_selector.setPrefix("Time limit: ")
+        self.time_limit_selector.setSuffix(" s")
+        self.time_limit_selector.setSpecialValueText("No time limit")
+        self.layout.addWidget(self.time_limit_selector)
+
+        self.memory_limit_selector = QSpinBox()
+        self.memory_limit_selector.setRange(0, 65536)
+        self.memory_limit_selector.setSingleStep(256)
+        self.memory_limit_selector.setValue(2048)
+        self.memory_limit_selector.setPrefix("Memory limit: ")
+        self.memory_limit_selector.setSuffix(" MB")
+        self.memory_limit_selector.setSpecialValueText("No memory limit")
+        self.layout.addWidget(self.memory_limit_selector)
+
         self.solve_button = QPushButton("Compare Algorithms")
         self.solve_button.clicked.connect(self.compare_algorithms)
         self.layout.addWidget(self.solve_button)
 
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel_comparison)
+        self.cancel_button.setEnabled(False)
+        self.layout.addWidget(self.cancel_button)
+
+        # Live progress of every running algorithm
+        self.progress_layout = QVBoxLayout()
+        self.layout.addLayout(self.progress_layout)
+        self.progress_rows = {}  # AlgorithmRunner -> (QLabel, QProgressBar)
+
         self.setLayout(self.layout)
 
         self.create_tiles()
@@ -103,70 +274,112 @@ class SlidingPuzzleComparison(QWidget):
         ]
 
     def shuffle_tiles(self):
-        """Shuffle the tiles by randomly moving them."""
-        for _ in range(10000):
-            self.move_random_tile()
-
-    def move_random_tile(self):
-        """Move a random tile into the empty space."""
-        y, x = self.empty_tile
-        moves = []
-        if y > 0:
-            moves.append((y - 1, x))  # Up
-        if y < self.size - 1:
-            moves.append((y + 1, x))  # Down
-        if x > 0:
-            moves.append((y, x - 1))  # Left
-        if x < self.size - 1:
-            moves.append((y, x + 1))  # Right
-
-        if moves:
-            new_y, new_x = random.choice(moves)
-            self.tiles[y][x], self.tiles[new_y][new_x] = (
-                self.tiles[new_y][new_x],
-                self.tiles[y][x],
-            )
-            self.empty_tile = (new_y, new_x)
-
-    def draw_tiles(self):
-        """Draw the tiles on the grid."""
-        for i in reversed(range(self.size)):
-            for j in range(self.size):
-                tile = self.tiles[i][j]
-                button = QPushButton(str(tile) if tile is not None else "")
-                button.setFixedSize(100, 100)
-                self.puzzle_frame.addWidget(button, i, j)
+        """Replace the tiles with a uniformly random solvable board."""
+        flat_tiles = random_board(self.size)
+        self.tiles = [
+            flat_tiles[i : i + self.size] for i in range(0, len(flat_tiles), self.size)
+        ]
+        self.empty_tile = divmod(flat_tiles.index(None), self.size)
 
     def draw_tiles(self):
         """Draw the tiles on the grid."""
-        for i in reversed(range(self.size)):
-            for j in range(self.size):
-                tile = self.tiles[i][j]
-                button = QPushButton(str(tile) if tile is not None else "")
-                button.setFixedSize(100, 100)
-                self.puzzle_frame.addWidget(button, i, j)
+        self.board.set_tiles(self.tiles)
 
     def compare_algorithms(self):
-        """Compare different algorithms for solving the puzzle."""
-        selected_algorithms = self.algorithm_selector.currentText()
-        algorithms_to_compare = selected_algorithms.split(", ")
-
-        for alg in algorithms_to_compare:
-            runner = AlgorithmRunner(alg, self.size, self.tiles, self.empty_tile)
+        """Compare different algorithms and heuristics for solving the puzzle."""
+        heuristics_to_compare = self.heuristic_selector.currentData() or ["Manhattan"]
+
+        self.results = []
+        self.runs = []
+        for alg in self.algorithm_selector.currentData():
+            if alg in INFORMED_ALGORITHMS:
+                self.runs.extend(
+                    (alg, heuristic) for heuristic in heuristics_to_compare
+                )
+            else:
+                self.runs.append((alg, "Manhattan"))
+
+        if not self.runs:
+            return
+
+        self.clear_progress()
+        self.runners = []
+        for alg, heuristic in self.runs:
+            runner = AlgorithmRunner(
+                alg,
+                self.size,
+                self.tiles,
+                self.empty_tile,
+                heuristic,
+                self.time_limit_selector.value(),
+                self.memory_limit_selector.value(),
+            )
             runner.finished.connect(self.show_algorithm_statistics)
-            threading.Thread(
-                target=runner.run
-            ).start()  # Start the algorithm in a new thread
+            runner.progress.connect(self.show_progress)
+            self.add_progress_row(runner)
+            self.runners.append(runner)
+            runner.run()  # Start the algorithm in its own process
+
+        self.solve_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+
+    def add_progress_row(self, runner):
+        """Add a label and a progress bar showing the progress of a runner."""
+        label = QLabel(f"{runner.name()}: starting...")
+        bar = QProgressBar()
+        if runner.time_limit:
+            # Progress towards the time limit
+            bar.setRange(0, runner.time_limit * 10)
+            bar.setFormat(f"%p% of {runner.time_limit} s")
+        else:
+            bar.setRange(0, 0)  # Busy indicator
+        self.progress_layout.addWidget(label)
+        self.progress_layout.addWidget(bar)
+        self.progress_rows[runner] = (label, bar)
+
+    def clear_progress(self):
+        """Remove the progress rows of the previous comparison."""
+        for label, bar in self.progress_rows.values():
+            label.deleteLater()
+            bar.deleteLater()
+        self.progress_rows = {}
+
+    def show_progress(self, metrics):
+        """Show the latest metrics of the runner that sent them."""
+        runner = self.sender()
+        label, bar = self.progress_rows[runner]
+        label.setText(format_progress(runner.name(), metrics))
+        if runner.time_limit:
+            bar.setValue(min(int(metrics["elapsed"] * 10), bar.maximum()))
+
+    def cancel_comparison(self):
+        """Stop every algorithm that is still running."""
+        for runner in self.runners:
+            runner.cancel()
+
+    def closeEvent(self, event):
+        # Non-daemonic workers would otherwise keep the application alive
+        self.cancel_comparison()
+        super().closeEvent(event)
 
     def show_algorithm_statistics(
         self, algorithm, statistics, nodes_expanded, nodes_stored
     ):
         """Store results of the algorithm run for later display."""
+        label, bar = self.progress_rows[self.sender()]
+        label.setText(f"{algorithm}: finished")
+        bar.setRange(0, 1)
+        bar.setValue(1)
+        bar.setFormat("Done")
+
         result_string = f"{algorithm} Statistics:\n{statistics}\n"
         self.results.append(result_string)  # Store results
 
         # Now check if all algorithms have been processed and display results if yes
-        if len(self.results) == len(self.algorithm_selector.currentText().split(", ")):
+        if len(self.results) == len(self.runs):
+            self.solve_button.setEnabled(True)
+            self.cancel_button.setEnabled(False)
+
             all_results = "\n".join(self.results)
             mbox = QMessageBox()
             mbox.setIcon(QMessageBox.Information)
@@ -0,0 +1,278 @@
+from collections import deque
+
+from successors import neighbor_table
+
+# The region left once the other rows and columns are in place, which is
+# solved by a search: at most FINAL_CELLS cells, e.g. 2x3 or 3x2
+FINAL_CELLS = 6
+
+
+class ConstructiveSolver:
+    """Non-optimal solver for rows x columns boards of any size.
+
+    The unsolved region shrinks one line at a time: its top row if it has at
+    least as many rows as columns, otherwise its left column. Every tile of a
+    line but the last two is slid to its cell along a greedy path, the empty
+    tile being routed around it by a short breadth-first search. The last two
+    are put into place together with the usual corner trick. Once at most
+    FINAL_CELLS cells are left, they are finished with a breadth-first search
+    over their arrangements, which yields the shortest ending.
+
+    Only the usual goal is supported: the tiles in order with the empty tile
+    in the bottom right corner.
+    """
+
+    def __init__(self, rows, columns, flat_tiles):
+        self.rows = rows
+        self.columns = columns
+        self.neighbors = neighbor_table(rows, columns)
+        self.cells = [tile or 0 for tile in flat_tiles]  # 0 is the empty tile
+        self.positions = [0] * len(self.cells)  # Tile -> cell it is in
+        for cell, tile in enumerate(self.cells):
+            self.positions[tile] = cell
+        self.fixed = bytearray(len(self.cells))  # Cells already in place
+        self.moves = []  # Cells the empty tile moved to
+        self.nodes_expanded = 0
+        self.nodes_stored = 0
+
+    def goal_tile(self, cell):
+        return (cell + 1) % len(self.cells)
+
+    def slide(self, cell):
+        """Slide the tile at a neighbor of the empty tile into the empty space."""
+        empty_i = self.positions[0]
+        tile = self.cells[cell]
+        self.cells[empty_i] = tile
+        self.positions[tile] = empty_i
+        self.cells[cell] = 0
+        self.positions[0] = cell
+        self.moves.append(cell)
+
+    def route_empty(self, target, avoid=-1):
+        """Move the empty tile to ``target`` along a shortest free path.
+
+        The path goes around fixed cells and the cell ``avoid``. Returns
+        False, without moving, if there is no such path.
+        """
+        start = self.positions[0]
+        if start == target:
+            return True
+        fixed = self.fixed
+        neighbors = self.neighbors
+        parents = {start: -1}
+        frontier = deque([start])
+        while frontier:
+            cell = frontier.popleft()
+            for neighbor in neighbors[cell]:
+                if neighbor in parents or fixed[neighbor] or neighbor == avoid:
+                    continue
+                parents[neighbor] = cell
+                if neighbor == target:
+                    route = []
+                    while neighbor != start:
+                        route.append(neighbor)
+                        neighbor = parents[neighbor]
+                    for step in reversed(route):
+                        self.slide(step)
+                    return True
+                frontier.append(neighbor)
+        return False
+
+    def move_tile(self, tile, target, vertical_first):
+        """Slide a tile to ``target`` one cell at a time, leaving fixed cells be.
+
+        Every step brings the tile closer to its target, vertically first or
+        horizontally first as asked, falling back to the other direction if
+        the empty tile cannot get in front of it. Returns False if neither
+        works, with the tile as close as it got.
+        """
+        columns = self.columns
+        target_y, target_x = divmod(target, columns)
+        while self.positions[tile] != target:
+            cell = self.positions[tile]
+            y, x = divmod(cell, columns)
+            vertical = [cell + columns * (1 if target_y > y else -1)]
+            horizontal = [cell + (1 if target_x > x else -1)]
+            steps = (vertical if y != target_y else []) + (
+                horizontal if x != target_x else []
+            )
+            if not vertical_first:
+                steps.reverse()
+            for step in steps:
+                if not self.fixed[step] and self.route_empty(step, avoid=cell):
+                    self.slide(cell)
+                    break
+            else:
+                return False
+        return True
+
+    def place_line(self, line, step, vertical_first):
+        """Put the tiles of ``line`` (cells along one edge) into place and fix them.
+
+        ``step`` leads from a cell of the line into the rest of the region.
+        The last two tiles, A and B, cannot be placed one after the other:
+        A goes to B's cell and B next to it, then both turn into place. B
+        gets stuck if the empty tile is shut in A's cell with B in front of
+        it, and untangle takes over then.
+        """
+        for cell in line[:-2]:
+            if not self.move_tile(self.goal_tile(cell), cell, vertical_first):
+                raise RuntimeError(f"No tile can be moved to cell {cell}")
+            self.fixed[cell] = 1
+
+        a, b = line[-2:]
+        tile_a = self.goal_tile(a)
+        tile_b = self.goal_tile(b)
+        if self.cells[a] != tile_a or self.cells[b] != tile_b:
+            if not self.move_tile(tile_a, b, vertical_first):
+                raise RuntimeError(f"No tile can be moved to cell {b}")
+            self.fixed[b] = 1
+            if self.move_tile(tile_b, b + step, vertical_first):
+                self.fixed[b + step] = 1
+                if not self.route_empty(a):
+                    raise RuntimeError(f"The empty tile cannot reach cell {a}")
+                self.fixed[b + step] = 0
+                self.slide(b)
+                self.slide(b + step)
+            else:
+                self.fixed[b] = 0
+                self.untangle(a, b, step)
+        self.fixed[a] = self.fixed[b] = 1
+
+    def untangle(self, a, b, step):
+        """Put the tiles of cells ``a`` and ``b`` into place when they are close.
+
+        Breadth-first search over the cells of the two tiles and the empty
+        tile, all of which must lie in the free part of the 3x3 window from
+        the cell before ``a`` to two steps into the region. The other tiles
+        of the window may be moved around.
+        """
+        columns = self.columns
+        a_y, a_x = divmod(a, columns)
+        along_y, along_x = divmod(b - a, columns)
+        step_y, step_x = divmod(step, columns)
+        window = set()
+        for i in (-1, 0, 1):
+            for j in (0, 1, 2):
+                y = a_y + i * along_y + j * step_y
+                x = a_x + i * along_x + j * step_x
+                if 0 <= y < self.rows and 0 <= x < columns:
+                    if not self.fixed[y * columns + x]:
+                        window.add(y * columns + x)
+
+        tile_a = self.goal_tile(a)
+        tile_b = self.goal_tile(b)
+        positions = self.positions
+        start = (positions[tile_a], positions[tile_b], positions[0])
+        if not window.issuperset(start):
+            raise RuntimeError(f"The tiles of cells {a} and {b} are out of reach")
+
+        # (cell of A, cell of B, cell of the empty tile) -> previous such triple
+        came_from = {start: None}
+        frontier = deque([start])
+        while frontier:
+            cells = frontier.popleft()
+            self.nodes_expanded += 1
+            if cells[:2] == (a, b):
+                break
+            cell_a, cell_b, empty_i = cells
+            for target in self.neighbors[empty_i]:
+                if target not in window:
+                    continue
+                if target == cell_a:
+                    new_cells = (empty_i, cell_b, target)
+                elif target == cell_b:
+                    new_cells = (cell_a, empty_i, target)
+                else:
+                    new_cells = (cell_a, cell_b, target)
+                if new_cells not in came_from:
+                    came_from[new_cells] = cells
+                    frontier.append(new_cells)
+        else:
+            raise RuntimeError(f"The tiles of cells {a} and {b} cannot be placed")
+        self.nodes_stored += len(came_from)
+
+        route = []
+        while came_from[cells] is not None:
+            route.append(cells[2])
+            cells = came_from[cells]
+        for cell in reversed(route):
+            self.slide(cell)
+
+    def finish(self, region):
+        """Solve the last few cells optimally by a search over their arrangements."""
+        start = tuple(self.cells[cell] for cell in region)
+        goal = tuple(self.goal_tile(cell) for cell in region)
+        local = {cell: i for i, cell in enumerate(region)}
+        neighbors = [
+            [local[neighbor] for neighbor in self.neighbors[cell] if neighbor in local]
+            for cell in region
+        ]
+
+        # Arrangement -> (previous arrangement, region index the empty tile moved to)
+        came_from = {start: None}
+        frontier = deque([start])
+        while frontier and goal not in came_from:
+            arrangement = frontier.popleft()
+            self.nodes_expanded += 1
+            empty_i = arrangement.index(0)
+            for target in neighbors[empty_i]:
+                tiles = list(arrangement)
+                tiles[empty_i], tiles[target] = tiles[target], 0
+                tiles = tuple(tiles)
+                if tiles not in came_from:
+                    came_from[tiles] = (arrangement, target)
+                    frontier.append(tiles)
+        self.nodes_stored += len(came_from)
+        if goal not in came_from:
+            raise ValueError("The goal cannot be reached from this board")
+
+        route = []
+        arrangement = goal
+        while came_from[arrangement] is not None:
+            arrangement, target = came_from[arrangement]
+            route.append(region[target])
+        for cell in reversed(route):
+            self.slide(cell)
+
+    def solve(self):
+        """Return the cells the empty tile moves to, from the start to the goal."""
+        rows, columns = self.rows, self.columns
+        top = left = 0
+        while (rows - top) * (columns - left) > FINAL_CELLS:
+            if rows - top >= columns - left:
+                line = [top * columns + x for x in range(left, columns)]
+                self.place_line(line, columns, vertical_first=False)
+                top += 1
+            else:
+                line = [y * columns + left for y in range(top, rows)]
+                self.place_line(line, 1, vertical_first=True)
+                left += 1
+
+        self.finish(
+            [y * columns + x for y in range(top, rows) for x in range(left, columns)]
+        )
+        return self.moves
+
+
+def solve_rectangle(board):
+    """Solve a rectangular 2-D board of at least 2x2 cells, not optimally.
+
+    The empty tile may be given as None or 0, and the goal is the tiles in
+    order with the empty tile last. Unsolvable boards raise ValueError.
+
+    Returns ``(moves, nodes_expanded, nodes_stored)`` as ``algorithms.solve``
+    does, the nodes being those of the search over the last few cells.
+    """
+    rows = len(board)
+    columns = len(board[0]) if rows else 0
+    if rows < 2 or columns < 2 or any(len(row) != columns for row in board):
+        raise ValueError("The board must be a rectangle of at least 2x2 tiles")
+
+    flat_tiles = [tile or None for row in board for tile in row]
+    if sorted(tile or 0 for tile in flat_tiles) != list(range(rows * columns)):
+        raise ValueError(f"The board must hold tiles 1 to {rows * columns - 1} once")
+
+    solver = ConstructiveSolver(rows, columns, flat_tiles)
+    moves = [divmod(cell, columns) for cell in solver.solve()]
+    return moves, solver.nodes_expanded, solver.nodes_stored
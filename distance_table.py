@@ -0,0 +1,150 @@
+import argparse
+import os
+from collections import deque
+from functools import lru_cache
+
+from pattern_database import DEFAULT_DIRECTORY, UNSET, rank_positions, table_length
+from successors import neighbor_table
+from table_files import map_table, write_atomically
+
+SIZE = 3
+CELLS = SIZE**2
+FILE_NAME = "distance_3x3.bin"
+# Longest optimal solution of a 3x3 board
+MAX_DISTANCE = 31
+
+
+NEIGHBORS = neighbor_table(SIZE)
+
+
+class DistanceTable:
+    """Exact optimal solution length of every 8-puzzle board.
+
+    The table holds one byte per permutation, indexed by ``rank_positions`` of
+    the cells of tiles 0 (the empty tile) to 8. Only half of the 9! boards
+    are solvable; the other half keep the value UNSET.
+    """
+
+    def __init__(self, table):
+        self.table = table
+        self.ranks = {}  # Cache of ranks_at
+
+    def ranks_at(self, distance):
+        """Ranks of all boards exactly ``distance`` moves from the goal.
+
+        Raises ValueError unless 0 <= distance <= MAX_DISTANCE, as other
+        byte values such as UNSET do not stand for distances.
+        """
+        if not 0 <= distance <= MAX_DISTANCE:
+            raise ValueError(
+                f"3x3 boards are 0 to {MAX_DISTANCE} moves from the goal, "
+                f"not {distance}"
+            )
+        if distance not in self.ranks:
+            ranks = []
+            value = bytes([distance])
+            rank = self.table.find(value)
+            while rank != -1:
+                ranks.append(rank)
+                rank = self.table.find(value, rank + 1)
+            self.ranks[distance] = ranks
+        return self.ranks[distance]
+
+    @classmethod
+    def build(cls):
+        """Fill the table with a retrograde breadth-first search from the goal."""
+        table = bytearray([UNSET]) * table_length(CELLS, CELLS)
+        goal = [CELLS - 1] + list(range(CELLS - 1))
+        table[rank_positions(goal, CELLS)] = 0
+        queue = deque([goal])
+
+        while queue:
+            positions = queue.popleft()
+            distance = table[rank_positions(positions, CELLS)] + 1
+            empty_i = positions[0]
+            cell_tiles = [0] * CELLS
+            for tile, cell in enumerate(positions):
+                cell_tiles[cell] = tile
+
+            for neighbor in NEIGHBORS[empty_i]:
+                new_positions = positions[:]
+                new_positions[0] = neighbor
+                new_positions[cell_tiles[neighbor]] = empty_i
+                rank = rank_positions(new_positions, CELLS)
+                if table[rank] == UNSET:
+                    table[rank] = distance
+                    queue.append(new_positions)
+
+        return cls(table)
+
+    def save(self, directory=DEFAULT_DIRECTORY):
+        """Write the table atomically as a raw byte file and return its path."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, FILE_NAME)
+        write_atomically(path, self.table)
+        return path
+
+    @classmethod
+    def load(cls, directory=DEFAULT_DIRECTORY):
+        """Memory-map a saved table read-only."""
+        path = os.path.join(directory, FILE_NAME)
+        return cls(map_table(path, table_length(CELLS, CELLS)))
+
+    @classmethod
+    def load_or_build(cls, directory=DEFAULT_DIRECTORY):
+        """Load the saved table, building and saving it first if it is missing."""
+        if not os.path.exists(os.path.join(directory, FILE_NAME)):
+            cls.build().save(directory)
+        return cls.load(directory)
+
+    def distance(self, positions):
+        """Optimal solution length for the cells of tiles 0 to 8 (UNSET if none)."""
+        return self.table[rank_positions(positions, CELLS)]
+
+    def descend(self, positions):
+        """Follow strictly decreasing distances to the goal.
+
+        Returns the empty tile's cells from the start to the goal, both
+        included, or None if the board is unsolvable.
+        """
+        positions = list(positions)
+        distance = self.distance(positions)
+        if distance == UNSET:
+            return None
+
+        cell_tiles = [0] * CELLS
+        for tile, cell in enumerate(positions):
+            cell_tiles[cell] = tile
+
+        trace = [positions[0]]
+        while distance:
+            empty_i = positions[0]
+            for neighbor in NEIGHBORS[empty_i]:
+                tile = cell_tiles[neighbor]
+                positions[0], positions[tile] = neighbor, empty_i
+                if self.distance(positions) == distance - 1:
+                    cell_tiles[empty_i], cell_tiles[neighbor] = tile, 0
+                    break
+                positions[0], positions[tile] = empty_i, neighbor
+            distance -= 1
+            trace.append(positions[0])
+        return trace
+
+
+@lru_cache(maxsize=None)
+def shared_table(directory=DEFAULT_DIRECTORY):
+    """The distance table of this process, loaded (or built) on first use."""
+    return DistanceTable.load_or_build(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the exhaustive 8-puzzle distance table."
+    )
+    parser.add_argument("--directory", default=DEFAULT_DIRECTORY)
+    args = parser.parse_args()
+    print(f"Saved {DistanceTable.build().save(args.directory)}")
+
+
+if __name__ == "__main__":
+    main()
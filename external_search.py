@@ -0,0 +1,84 @@
+import heapq
+import os
+
+# Records read from a layer file at once
+READ_RECORDS = 4096
+
+
+def record_size(encoding):
+    """Bytes per state record, enough for every field of the packed state."""
+    return (encoding.cells * encoding.bits + 7) // 8
+
+
+def layer_path(directory, depth):
+    """File holding the states ``depth`` moves from the start."""
+    return os.path.join(directory, f"layer-{depth}.bin")
+
+
+def write_states(path, states, size):
+    """Write states as fixed-width big-endian records and return their count.
+
+    Big-endian records sort bytewise in the same order as the states, and
+    fixed widths make the file searchable with seeks, see contains.
+    """
+    count = 0
+    with open(path, "wb") as layer_file:
+        buffer = []
+        for state in states:
+            buffer.append(state.to_bytes(size, "big"))
+            if len(buffer) == READ_RECORDS:
+                layer_file.write(b"".join(buffer))
+                count += len(buffer)
+                buffer = []
+        layer_file.write(b"".join(buffer))
+        count += len(buffer)
+    return count
+
+
+def read_states(path, size):
+    """Stream the states of a file written by write_states, in file order."""
+    with open(path, "rb") as layer_file:
+        while True:
+            chunk = layer_file.read(size * READ_RECORDS)
+            if not chunk:
+                return
+            for offset in range(0, len(chunk), size):
+                yield int.from_bytes(chunk[offset : offset + size], "big")
+
+
+def merge_unique(sorted_streams):
+    """Merge sorted streams of states into one sorted stream without duplicates."""
+    last = None
+    for state in heapq.merge(*sorted_streams):
+        if state != last:
+            yield state
+            last = state
+
+
+def subtract(states, excluded):
+    """States of a sorted stream that are not in another sorted stream."""
+    excluded = iter(excluded)
+    other = next(excluded, None)
+    for state in states:
+        while other is not None and other < state:
+            other = next(excluded, None)
+        if state != other:
+            yield state
+
+
+def contains(path, size, state):
+    """Binary search a sorted layer file for a state."""
+    with open(path, "rb") as layer_file:
+        low = 0
+        high = os.path.getsize(path) // size
+        while low < high:
+            middle = (low + high) // 2
+            layer_file.seek(middle * size)
+            found = int.from_bytes(layer_file.read(size), "big")
+            if found == state:
+                return True
+            if found < state:
+                low = middle + 1
+            else:
+                high = middle
+    return False
@@ -0,0 +1,252 @@
+from collections import deque
+from functools import lru_cache
+from itertools import permutations
+
+
+@lru_cache(maxsize=None)
+def manhattan_table(size, goal_cells):
+    """Build the Manhattan distance of every tile from every cell.
+
+    ``table[tile][cell]`` is the distance tile ``tile`` has to travel from
+    flat index ``cell`` to its goal cell in ``goal_cells``. Row 0 belongs to
+    the empty tile and is all zeros. Tables are built once per board size and
+    goal and shared.
+    """
+    table = [(0,) * size**2]
+    for tile in range(1, size**2):
+        goal_y, goal_x = divmod(goal_cells[tile], size)
+        table.append(
+            tuple(
+                abs(goal_y - y) + abs(goal_x - x)
+                for y in range(size)
+                for x in range(size)
+            )
+        )
+    return tuple(table)
+
+
+class ManhattanDistance:
+    """Manhattan distance heuristic backed by a precomputed lookup table.
+
+    Sliding a tile only changes that tile's own contribution, so a child's
+    value is derived from its parent's with ``update`` in O(1).
+    """
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        self.table = manhattan_table(encoding.size, tuple(encoding.goal_cells))
+
+    def evaluate(self, state):
+        """Calculate the heuristic value of a packed state from scratch."""
+        table = self.table
+        bits = self.encoding.bits
+        mask = self.encoding.mask
+        return sum(
+            table[(state >> (cell * bits)) & mask][cell]
+            for cell in range(self.encoding.cells)
+        )
+
+    def update(self, h, state, new_state, tile, source, target):
+        """Get the new value after ``tile`` slides from ``source`` to ``target``."""
+        distances = self.table[tile]
+        return h - distances[source] + distances[target]
+
+
+def line_conflict(goal_offsets):
+    """Extra moves forced by tiles that share their goal line but are out of order.
+
+    ``goal_offsets`` are the goal positions along the line of the tiles that
+    belong in it, in their current order. All but a longest increasing
+    subsequence of them have to step out of the line and back, which costs
+    two moves each on top of the Manhattan distance.
+    """
+    longest = [1] * len(goal_offsets)
+    for i in range(len(goal_offsets)):
+        for j in range(i):
+            if goal_offsets[j] < goal_offsets[i]:
+                longest[i] = max(longest[i], longest[j] + 1)
+    return 2 * (len(goal_offsets) - max(longest, default=0))
+
+
+@lru_cache(maxsize=None)
+def line_conflict_table(size):
+    """Precompute ``line_conflict`` for every possible line of a board size."""
+    return {
+        offsets: line_conflict(offsets)
+        for length in range(size + 1)
+        for offsets in permutations(range(size), length)
+    }
+
+
+class LinearConflict(ManhattanDistance):
+    """Manhattan distance plus linear conflicts in every row and column.
+
+    Moving a tile sideways keeps the order of tiles in its row and only
+    changes the two columns it moves between (and vice versa), so ``update``
+    rescans just those two lines.
+    """
+
+    def __init__(self, encoding):
+        super().__init__(encoding)
+        size = encoding.size
+        self.conflicts = line_conflict_table(size)
+        self.rows = [tuple(range(y * size, (y + 1) * size)) for y in range(size)]
+        self.columns = [tuple(range(x, size**2, size)) for x in range(size)]
+        self.goal_rows = [cell // size for cell in encoding.goal_cells]
+        self.goal_columns = [cell % size for cell in encoding.goal_cells]
+
+    def row_conflict(self, state, y):
+        bits = self.encoding.bits
+        mask = self.encoding.mask
+        offsets = []
+        for cell in self.rows[y]:
+            tile = (state >> (cell * bits)) & mask
+            if tile and self.goal_rows[tile] == y:
+                offsets.append(self.goal_columns[tile])
+        return self.conflicts[tuple(offsets)]
+
+    def column_conflict(self, state, x):
+        bits = self.encoding.bits
+        mask = self.encoding.mask
+        offsets = []
+        for cell in self.columns[x]:
+            tile = (state >> (cell * bits)) & mask
+            if tile and self.goal_columns[tile] == x:
+                offsets.append(self.goal_rows[tile])
+        return self.conflicts[tuple(offsets)]
+
+    def evaluate(self, state):
+        """Calculate the heuristic value of a packed state from scratch."""
+        size = self.encoding.size
+        return (
+            super().evaluate(state)
+            + sum(self.row_conflict(state, y) for y in range(size))
+            + sum(self.column_conflict(state, x) for x in range(size))
+        )
+
+    def update(self, h, state, new_state, tile, source, target):
+        """Get the new value after ``tile`` slides from ``source`` to ``target``."""
+        h = super().update(h, state, new_state, tile, source, target)
+        source_y, source_x = divmod(source, self.encoding.size)
+        target_y, target_x = divmod(target, self.encoding.size)
+
+        if source_y == target_y:
+            lines, conflict = (source_x, target_x), self.column_conflict
+        else:
+            lines, conflict = (source_y, target_y), self.row_conflict
+        for line in lines:
+            h += conflict(new_state, line) - conflict(state, line)
+        return h
+
+
+@lru_cache(maxsize=None)
+def walking_distance_table(size, blank_goal_row):
+    """Breadth-first search over the row-count abstraction of the board.
+
+    An abstract state counts, for every row, how many of its tiles belong in
+    each goal row, plus the row of the empty tile. Only vertical moves change
+    it, so its distance from the goal counts the vertical moves still needed.
+    The same kind of table serves columns by transposing the board.
+    """
+    goal = tuple(
+        size - (row == blank_goal_row) if goal_row == row else 0
+        for row in range(size)
+        for goal_row in range(size)
+    )
+    table = {(goal, blank_goal_row): 0}
+    queue = deque([(goal, blank_goal_row)])
+
+    while queue:
+        counts, blank_row = queue.popleft()
+        distance = table[(counts, blank_row)] + 1
+        for row in (blank_row - 1, blank_row + 1):
+            if not 0 <= row < size:
+                continue
+            for goal_row in range(size):
+                if not counts[row * size + goal_row]:
+                    continue
+                # A tile of goal_row moves from row into the empty tile's row
+                new_counts = list(counts)
+                new_counts[row * size + goal_row] -= 1
+                new_counts[blank_row * size + goal_row] += 1
+                key = (tuple(new_counts), row)
+                if key not in table:
+                    table[key] = distance
+                    queue.append(key)
+
+    return table
+
+
+class WalkingDistance:
+    """Walking distance heuristic: vertical plus horizontal abstract distances.
+
+    Built for boards up to 4x4, where the table has 24,964 entries; larger
+    boards have too many abstract states to enumerate.
+    """
+
+    max_size = 4
+
+    def __init__(self, encoding):
+        if encoding.size > self.max_size:
+            raise ValueError(
+                f"Walking distance supports boards up to "
+                f"{self.max_size}x{self.max_size}"
+            )
+        self.encoding = encoding
+        blank_goal_y, blank_goal_x = divmod(encoding.goal_blank, encoding.size)
+        self.vertical_table = walking_distance_table(encoding.size, blank_goal_y)
+        self.horizontal_table = walking_distance_table(encoding.size, blank_goal_x)
+
+    def evaluate(self, state):
+        """Calculate the heuristic value of a packed state from scratch."""
+        size = self.encoding.size
+        bits = self.encoding.bits
+        mask = self.encoding.mask
+        vertical = [0] * size**2
+        horizontal = [0] * size**2
+
+        for cell in range(size**2):
+            tile = (state >> (cell * bits)) & mask
+            y, x = divmod(cell, size)
+            if not tile:
+                blank_y, blank_x = y, x
+                continue
+            goal_y, goal_x = divmod(self.encoding.goal_cells[tile], size)
+            vertical[y * size + goal_y] += 1
+            horizontal[x * size + goal_x] += 1
+
+        return (
+            self.vertical_table[(tuple(vertical), blank_y)]
+            + self.horizontal_table[(tuple(horizontal), blank_x)]
+        )
+
+    def update(self, h, state, new_state, tile, source, target):
+        """Get the new value after ``tile`` slides from ``source`` to ``target``."""
+        return self.evaluate(new_state)
+
+
+def load_pattern_database(encoding):
+    """Load the default additive pattern databases (built beforehand)."""
+    from pattern_database import AdditivePatternDatabase
+
+    return AdditivePatternDatabase.load(encoding)
+
+
+# Heuristics selectable by name, each built from a BoardEncoding
+HEURISTICS = {
+    "Manhattan": ManhattanDistance,
+    "Linear Conflict": LinearConflict,
+    "Walking Distance": WalkingDistance,
+    "Pattern Database": load_pattern_database,
+}
+
+
+def make_heuristic(heuristic, encoding):
+    """Build a heuristic from its name in HEURISTICS, or pass an object through."""
+    if heuristic is None:
+        heuristic = "Manhattan"
+    if isinstance(heuristic, str):
+        if heuristic not in HEURISTICS:
+            raise ValueError(f"Unknown heuristic: {heuristic}")
+        return HEURISTICS[heuristic](encoding)
+    return heuristic
@@ -0,0 +1,57 @@
+import heapq
+
+
+class BucketOpenList:
+    """Open list of A* with one bucket per f-value and no duplicate states.
+
+    Each bucket holds a stack of entries for every cost g, and ties on f go
+    to the highest g, i.e. the node closest to the goal. Only the distinct
+    f-values are kept in a heap, and there are few of them since f-values
+    are small numbers. Pushing and popping are therefore O(1) apart from the
+    first push of a new f-value.
+
+    Pushing a state that is already open replaces its entry: the old entry
+    stays in its bucket but is skipped when it comes up, so every state has
+    at most one live entry. ``len`` counts live entries only.
+    """
+
+    def __init__(self):
+        self.buckets = {}  # f -> list indexed by g of (state, empty_i, h) stacks
+        self.f_values = []  # Heap of the f-values that have a bucket
+        self.live = {}  # State -> g of its live entry
+
+    def push(self, f, g, state, empty_i, h):
+        """Add a state with cost ``g``, replacing any costlier open entry of it."""
+        self.live[state] = g
+        bucket = self.buckets.get(f)
+        if bucket is None:
+            bucket = self.buckets[f] = []
+            heapq.heappush(self.f_values, f)
+        while len(bucket) <= g:
+            bucket.append([])
+        bucket[g].append((state, empty_i, h))
+
+    def pop(self):
+        """Remove a live entry with the lowest f (highest g on ties).
+
+        Returns ``(f, g, state, empty_i, h)``. The list must not be empty.
+        """
+        live = self.live
+        while True:
+            f = self.f_values[0]
+            bucket = self.buckets[f]
+            while bucket and not bucket[-1]:
+                bucket.pop()  # Drop the stacks of costs with no entries left
+            if not bucket:
+                heapq.heappop(self.f_values)
+                del self.buckets[f]
+                continue
+
+            g = len(bucket) - 1
+            state, empty_i, h = bucket[g].pop()
+            if live.get(state) == g:
+                del live[state]
+                return f, g, state, empty_i, h
+
+    def __len__(self):
+        return len(self.live)
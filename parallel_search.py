@@ -0,0 +1,291 @@
+import heapq
+import multiprocessing
+import queue
+import time
+
+from board_encoding import BoardEncoding
+from heuristics import make_heuristic
+from successors import neighbor_table
+
+# Worker processes are spawned so that they start from a clean interpreter
+PROCESS_CONTEXT = multiprocessing.get_context("spawn")
+
+# Nodes sent to another worker in one message
+BATCH_SIZE = 128
+# Expansions between two flushes of a worker's outgoing batches (and checks
+# of its inbox)
+FLUSH_INTERVAL = 64
+# Seconds an idle worker waits for nodes, and between termination checks
+POLL_INTERVAL = 0.01
+
+# Multiplicative hash spreading the states of a neighborhood over all workers
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+HASH_MASK = (1 << 64) - 1
+
+# Fields of the shared counters
+INCUMBENT, SENT, RECEIVED = range(3)
+NO_SOLUTION = (1 << 62) - 1
+# Fields published by every worker
+EXPANDED, OPEN, STORED, DEPTH, IDLE = range(5)
+WORKER_FIELDS = 5
+
+
+class SearchWorkerError(RuntimeError):
+    """Raised when a worker process of a ParallelSearch dies during the search."""
+
+
+def owner(state, workers):
+    """Index of the worker that owns (stores and expands) a state."""
+    return ((hash(state) * HASH_MULTIPLIER & HASH_MASK) >> 32) % workers
+
+
+def search_worker(
+    index, size, tiles, goal_tiles, heuristic, inboxes, replies, lock, counters, stats
+):
+    """Process target running one worker of a ParallelSearch.
+
+    The worker runs A* on the states it owns. Children owned by other
+    workers are batched and sent to their owners' inboxes. Any goal found
+    lowers the shared incumbent solution cost, and nodes that cannot beat it
+    are pruned. A worker is idle once it has nothing left below the
+    incumbent and has sent all its batches.
+
+    Inbox messages are ``("nodes", batch)``, ``("parent", state)`` (answered
+    on ``replies`` with the empty tile index of the state's parent) and
+    ``("stop", None)``.
+    """
+    encoding = BoardEncoding(size, goal_tiles)
+    estimator = make_heuristic(heuristic, encoding)
+    slide = encoding.slide
+    tile_at = encoding.tile_at
+    update_h = estimator.update
+    goal_state = encoding.goal
+    neighbors = neighbor_table(size)
+    workers = len(inboxes)
+    inbox = inboxes[index]
+    parent_process = multiprocessing.parent_process()
+    fields = index * WORKER_FIELDS
+
+    # (f, cost, state, empty_i, h)
+    frontier = []
+    reached = {}
+    came_from = {}
+    outboxes = [[] for _ in range(workers)]
+    nodes_expanded = 0
+    depth = 0
+
+    def add(state, empty_i, cost, h, parent_empty_i):
+        if cost >= reached.get(state, NO_SOLUTION):
+            return
+        reached[state] = cost
+        came_from[state] = parent_empty_i
+        if state == goal_state:
+            with lock:
+                counters[INCUMBENT] = min(counters[INCUMBENT], cost)
+        else:
+            heapq.heappush(frontier, (cost + h, cost, state, empty_i, h))
+
+    def flush():
+        for target, nodes in enumerate(outboxes):
+            if nodes:
+                # Counted before sending, so a batch in flight is never missed
+                with lock:
+                    counters[SENT] += 1
+                inboxes[target].put(("nodes", nodes))
+                outboxes[target] = []
+
+    def publish(idle):
+        with lock:
+            stats[fields + EXPANDED] = nodes_expanded
+            stats[fields + OPEN] = len(frontier)
+            stats[fields + STORED] = len(reached)
+            stats[fields + DEPTH] = depth
+            stats[fields + IDLE] = idle
+
+    def handle(message):
+        kind, value = message
+        if kind == "nodes":
+            with lock:
+                stats[fields + IDLE] = 0
+                counters[RECEIVED] += 1
+            for node in value:
+                add(*node)
+        elif kind == "parent":
+            replies.put(came_from[value])
+        return kind != "stop"
+
+    initial_state = encoding.encode(tiles)
+    if owner(initial_state, workers) == index:
+        add(
+            initial_state,
+            encoding.blank_index(initial_state),
+            0,
+            estimator.evaluate(initial_state),
+            -1,
+        )
+
+    running = True
+    while running:
+        incumbent = counters[INCUMBENT]
+        if frontier and frontier[0][0] >= incumbent:
+            frontier.clear()  # Nothing left here can lead to a shorter solution
+
+        if not frontier:
+            flush()
+            publish(1)
+            try:
+                running = handle(inbox.get(timeout=POLL_INTERVAL))
+            except queue.Empty:
+                running = parent_process.is_alive()
+            continue
+
+        f, cost, state, empty_i, h = heapq.heappop(frontier)
+        if cost > reached[state]:
+            continue  # Reached again with a lower cost since it was pushed
+        nodes_expanded += 1
+        depth = cost
+
+        parent_empty_i = came_from[state]
+        for target in neighbors[empty_i]:
+            if target == parent_empty_i:
+                continue  # Undoing the last move leads back to the parent
+            new_state = slide(state, empty_i, target)
+            new_h = update_h(
+                h, state, new_state, tile_at(state, target), target, empty_i
+            )
+            new_cost = cost + 1
+            if new_cost + new_h >= incumbent:
+                continue
+            target_owner = owner(new_state, workers)
+            if target_owner == index:
+                add(new_state, target, new_cost, new_h, empty_i)
+            else:
+                outboxes[target_owner].append(
+                    (new_state, target, new_cost, new_h, empty_i)
+                )
+                if len(outboxes[target_owner]) >= BATCH_SIZE:
+                    flush()
+
+        if nodes_expanded % FLUSH_INTERVAL == 0:
+            flush()
+            while running:
+                try:
+                    running = handle(inbox.get_nowait())
+                except queue.Empty:
+                    break
+            publish(0)
+            running = running and parent_process.is_alive()
+
+    # Batches left over after an aborted search must not block the exit
+    for other_inbox in inboxes:
+        other_inbox.cancel_join_thread()
+    replies.cancel_join_thread()
+
+
+class ParallelSearch:
+    """Hash-distributed A* (HDA*) over several worker processes.
+
+    Every state is owned by one worker, chosen by hashing it, which stores
+    and expands it. The search is over when every worker is idle and every
+    batch sent has been received. All nodes that could lead to a shorter
+    solution have been expanded by then, so the incumbent is optimal.
+    """
+
+    def __init__(self, workers, size, tiles, goal_tiles, heuristic):
+        self.workers = workers
+        self.lock = PROCESS_CONTEXT.Lock()
+        self.counters = PROCESS_CONTEXT.RawArray("q", [NO_SOLUTION, 0, 0])
+        self.stats = PROCESS_CONTEXT.RawArray("q", workers * WORKER_FIELDS)
+        self.inboxes = [PROCESS_CONTEXT.Queue() for _ in range(workers)]
+        self.replies = PROCESS_CONTEXT.Queue()
+        self.processes = [
+            PROCESS_CONTEXT.Process(
+                target=search_worker,
+                args=(
+                    index,
+                    size,
+                    tiles,
+                    goal_tiles,
+                    heuristic,
+                    self.inboxes,
+                    self.replies,
+                    self.lock,
+                    self.counters,
+                    self.stats,
+                ),
+                daemon=True,
+            )
+            for index in range(workers)
+        ]
+
+    def start(self):
+        for process in self.processes:
+            process.start()
+
+    def check_workers(self):
+        """Raise SearchWorkerError if a worker has exited (e.g. killed by the OS).
+
+        Workers only exit once stopped by ``close``, and a search missing one
+        would never end.
+        """
+        for index, process in enumerate(self.processes):
+            if process.exitcode is not None:
+                raise SearchWorkerError(
+                    f"Search worker {index} exited with code {process.exitcode}"
+                )
+
+    def finished(self):
+        """Wait POLL_INTERVAL and tell whether the search has ended.
+
+        Raises SearchWorkerError if a worker has died.
+        """
+        time.sleep(POLL_INTERVAL)
+        self.check_workers()
+        with self.lock:
+            idle = all(
+                self.stats[index * WORKER_FIELDS + IDLE]
+                for index in range(self.workers)
+            )
+            return idle and self.counters[SENT] == self.counters[RECEIVED]
+
+    @property
+    def solution_cost(self):
+        """Cost of the best solution found so far, or None."""
+        cost = self.counters[INCUMBENT]
+        return None if cost == NO_SOLUTION else cost
+
+    def totals(self):
+        """Nodes expanded, open and stored over all workers, and the deepest cost."""
+        with self.lock:
+            fields = [
+                self.stats[index * WORKER_FIELDS : (index + 1) * WORKER_FIELDS]
+                for index in range(self.workers)
+            ]
+        return (
+            sum(field[EXPANDED] for field in fields),
+            sum(field[OPEN] for field in fields),
+            sum(field[STORED] for field in fields),
+            max(field[DEPTH] for field in fields),
+        )
+
+    def parent_of(self, state):
+        """Empty tile index of the parent of a reached state (-1 for the start)."""
+        self.inboxes[owner(state, self.workers)].put(("parent", state))
+        while True:
+            try:
+                return self.replies.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                self.check_workers()
+
+    def close(self):
+        """Stop the workers, and kill those that do not stop by themselves."""
+        for inbox in self.inboxes:
+            inbox.put(("stop", None))
+        for process in self.processes:
+            if process.pid is not None:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+        for inbox in self.inboxes:
+            inbox.cancel_join_thread()
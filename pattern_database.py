@@ -0,0 +1,276 @@
+import argparse
+import os
+
+from successors import neighbor_table
+from table_files import map_table, write_atomically
+
+# Disjoint tile groups used when no partition is given
+DEFAULT_PARTITIONS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+}
+
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdb")
+
+UNSET = 255  # Table entries are single bytes, 255 marks "not reached yet"
+
+
+def table_length(cells, pattern_size):
+    """Number of ways to place ``pattern_size`` distinct tiles on ``cells`` cells."""
+    length = 1
+    for i in range(pattern_size):
+        length *= cells - i
+    return length
+
+
+def rank_positions(positions, cells):
+    """Rank a sequence of distinct cells among all such sequences.
+
+    This is a mixed-radix Lehmer code: every position is counted only among
+    the cells not used by the positions before it, so the ranks are dense in
+    ``range(table_length(cells, len(positions)))``.
+    """
+    rank = 0
+    used = 0
+    for i, position in enumerate(positions):
+        smaller_used = (used & ((1 << position) - 1)).bit_count()
+        rank = rank * (cells - i) + position - smaller_used
+        used |= 1 << position
+    return rank
+
+
+def unrank_positions(rank, cells, length):
+    """Inverse of rank_positions: the ``length`` distinct cells with this rank."""
+    digits = []
+    for i in reversed(range(length)):
+        rank, digit = divmod(rank, cells - i)
+        digits.append(digit)
+
+    free = list(range(cells))
+    return [free.pop(digit) for digit in reversed(digits)]
+
+
+def file_name(size, pattern):
+    """Name of the table file for one pattern."""
+    return f"pdb_{size}x{size}_{'-'.join(map(str, pattern))}.bin"
+
+
+class PatternDatabase:
+    """Exact solution lengths of one group of tiles, ignoring all other tiles.
+
+    The table is indexed by ``rank_positions`` of the pattern tiles' cells and
+    stores how many moves of *pattern tiles* are needed to bring them home.
+    Because moves of other tiles are free, the values of disjoint groups can
+    be added together and still never overestimate.
+    """
+
+    def __init__(self, size, pattern, table):
+        self.size = size
+        self.pattern = tuple(pattern)
+        self.table = table
+
+    @classmethod
+    def build(cls, size, pattern):
+        """Compute the table with a retrograde breadth-first search from the goal.
+
+        Abstract states are the pattern tiles' cells plus the region of free
+        cells the empty tile can wander in at no cost. That region is
+        identified by its lowest cell, which keeps the search far smaller than
+        one that tracks the exact empty cell.
+        """
+        cells = size**2
+        pattern = tuple(pattern)
+        neighbors = neighbor_table(size)
+        regions = {}
+
+        def region_of(cell, occupied):
+            """Bit mask of the free cells reachable from ``cell``."""
+            key = (occupied, cell)
+            if key not in regions:
+                region = 1 << cell
+                stack = [cell]
+                while stack:
+                    for neighbor in neighbors[stack.pop()]:
+                        bit = 1 << neighbor
+                        if not (region | occupied) & bit:
+                            region |= bit
+                            stack.append(neighbor)
+                regions[key] = region
+            return regions[key]
+
+        def lowest_cell(mask):
+            return (mask & -mask).bit_length() - 1
+
+        table = bytearray([UNSET]) * table_length(cells, len(pattern))
+        seen = bytearray((len(table) * cells + 7) // 8)
+
+        goal_positions = tuple(tile - 1 for tile in pattern)
+        goal_occupied = sum(1 << position for position in goal_positions)
+        goal_region = lowest_cell(region_of(cells - 1, goal_occupied))
+        key = rank_positions(goal_positions, cells) * cells + goal_region
+        seen[key >> 3] |= 1 << (key & 7)
+
+        layer = [(goal_positions, goal_region)]
+        depth = 0
+        while layer:
+            next_layer = []
+            for positions, region_cell in layer:
+                rank = rank_positions(positions, cells)
+                if table[rank] == UNSET:
+                    table[rank] = depth
+
+                occupied = sum(1 << position for position in positions)
+                region = region_of(region_cell, occupied)
+                free = region
+                while free:
+                    cell = lowest_cell(free)
+                    free &= free - 1
+                    for neighbor in neighbors[cell]:
+                        if not occupied & (1 << neighbor):
+                            continue
+                        # Slide the pattern tile on ``neighbor`` into ``cell``
+                        j = positions.index(neighbor)
+                        new_positions = positions[:j] + (cell,) + positions[j + 1 :]
+                        new_occupied = occupied ^ (1 << neighbor) ^ (1 << cell)
+                        new_region = lowest_cell(region_of(neighbor, new_occupied))
+                        key = rank_positions(new_positions, cells) * cells + new_region
+                        if not seen[key >> 3] & (1 << (key & 7)):
+                            seen[key >> 3] |= 1 << (key & 7)
+                            next_layer.append((new_positions, new_region))
+            layer = next_layer
+            depth += 1
+
+        return cls(size, pattern, table)
+
+    def save(self, directory=DEFAULT_DIRECTORY):
+        """Write the table as a raw byte file and return its path.
+
+        The file is replaced atomically, so processes building the same table
+        at once never map a partly written or truncated file.
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, file_name(self.size, self.pattern))
+        write_atomically(path, self.table)
+        return path
+
+    @classmethod
+    def load(cls, size, pattern, directory=DEFAULT_DIRECTORY):
+        """Memory-map a saved table read-only, shared between processes."""
+        path = os.path.join(directory, file_name(size, pattern))
+        return cls(size, pattern, map_table(path, table_length(size**2, len(pattern))))
+
+
+class AdditivePatternDatabase:
+    """Heuristic summing the values of disjoint pattern databases.
+
+    Has the same ``evaluate``/``update`` interface as the heuristics in
+    ``heuristics.py``, so it can be passed to PuzzleAlgorithms for ``a_star``
+    and ``ida_star``.
+    """
+
+    def __init__(self, encoding, databases):
+        if not encoding.is_standard_goal:
+            raise ValueError("Pattern databases are built for the standard goal")
+        self.encoding = encoding
+        self.databases = list(databases)
+
+        covered = [tile for database in self.databases for tile in database.pattern]
+        if len(covered) != len(set(covered)):
+            raise ValueError("Pattern databases must use disjoint tile groups")
+
+        # Which database each tile's moves are charged to (None if no database)
+        self.tile_database = [None] * encoding.cells
+        for database in self.databases:
+            for tile in database.pattern:
+                self.tile_database[tile] = database
+
+    @classmethod
+    def load(cls, encoding, partition=None, directory=DEFAULT_DIRECTORY):
+        """Load the saved databases for a partition of the tiles.
+
+        Building a table takes from seconds to many minutes, far too long to
+        happen in the middle of a timed search (and in every worker at once),
+        so missing tables raise ValueError naming the command that builds them.
+        """
+        size = encoding.size
+        command = f"python pattern_database.py --size {size}"
+        if partition is None:
+            if size not in DEFAULT_PARTITIONS:
+                sizes = ", ".join(f"{n}x{n}" for n in DEFAULT_PARTITIONS)
+                raise ValueError(
+                    f"Pattern databases have default partitions for {sizes} only"
+                )
+            partition = DEFAULT_PARTITIONS[size]
+        else:
+            groups = "/".join(",".join(map(str, pattern)) for pattern in partition)
+            command += f" --partition {groups}"
+        if directory != DEFAULT_DIRECTORY:
+            command += f" --directory {directory}"
+
+        databases = []
+        for pattern in partition:
+            path = os.path.join(directory, file_name(size, pattern))
+            if not os.path.exists(path):
+                raise ValueError(f"{path} is missing, build it with: {command}")
+            databases.append(PatternDatabase.load(size, pattern, directory))
+        return cls(encoding, databases)
+
+    def positions(self, state):
+        """Map every tile of a packed state to its flat index."""
+        bits = self.encoding.bits
+        mask = self.encoding.mask
+        positions = [0] * self.encoding.cells
+        for cell in range(self.encoding.cells):
+            positions[(state >> (cell * bits)) & mask] = cell
+        return positions
+
+    def value(self, database, positions):
+        """Look up one database for a tile -> cell mapping."""
+        pattern_positions = [positions[tile] for tile in database.pattern]
+        return database.table[rank_positions(pattern_positions, self.encoding.cells)]
+
+    def evaluate(self, state):
+        """Calculate the heuristic value of a packed state from scratch."""
+        positions = self.positions(state)
+        return sum(self.value(database, positions) for database in self.databases)
+
+    def update(self, h, state, new_state, tile, source, target):
+        """Get the new value after ``tile`` slides from ``source`` to ``target``."""
+        database = self.tile_database[tile]
+        if database is None:
+            return h
+        positions = self.positions(new_state)
+        new_value = self.value(database, positions)
+        positions[tile] = source
+        return h - self.value(database, positions) + new_value
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build additive pattern databases for the sliding puzzle."
+    )
+    parser.add_argument("--size", type=int, default=4, help="board width")
+    parser.add_argument(
+        "--partition",
+        help="tile groups such as '1,5,6,9,10,13/7,8,11,12,14,15/2,3,4'",
+    )
+    parser.add_argument("--directory", default=DEFAULT_DIRECTORY)
+    args = parser.parse_args()
+
+    if args.partition:
+        partition = [
+            tuple(int(tile) for tile in group.split(","))
+            for group in args.partition.split("/")
+        ]
+    elif args.size in DEFAULT_PARTITIONS:
+        partition = DEFAULT_PARTITIONS[args.size]
+    else:
+        parser.error(f"no default partition for size {args.size}, give --partition")
+
+    for pattern in partition:
+        path = PatternDatabase.build(args.size, pattern).save(args.directory)
+        print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    main()
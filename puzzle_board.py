@@ -0,0 +1,49 @@
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtWidgets import QGridLayout, QPushButton, QWidget
+
+# Tiles shrink on larger boards to keep the board on screen
+BOARD_PIXELS = 800
+MIN_TILE_SIZE = 32
+MAX_TILE_SIZE = 100
+
+
+class PuzzleBoard(QWidget):
+    """Grid of tile buttons, created once and relabelled as tiles move.
+
+    A move only changes the labels of the two cells it touches, so redraws
+    cost the same on any board size and no widgets are ever added after
+    construction.
+    """
+
+    # (row, column) of a clicked tile
+    tile_clicked = pyqtSignal(int, int)
+
+    def __init__(self, size, parent=None):
+        super().__init__(parent)
+        self.size = size
+        tile_size = max(MIN_TILE_SIZE, min(MAX_TILE_SIZE, BOARD_PIXELS // size))
+
+        layout = QGridLayout()
+        self.buttons = []
+        for i in range(size):
+            row = []
+            for j in range(size):
+                button = QPushButton()
+                button.setFixedSize(tile_size, tile_size)
+                button.clicked.connect(
+                    lambda checked, y=i, x=j: self.tile_clicked.emit(y, x)
+                )
+                layout.addWidget(button, i, j)
+                row.append(button)
+            self.buttons.append(row)
+        self.setLayout(layout)
+
+    def set_tiles(self, tiles):
+        """Show a whole 2-D grid of tiles, with None for the empty tile."""
+        for i, row in enumerate(tiles):
+            for j, tile in enumerate(row):
+                self.set_tile(i, j, tile)
+
+    def set_tile(self, y, x, tile):
+        """Show ``tile`` (None for the empty tile) in one cell."""
+        self.buttons[y][x].setText("" if tile is None else str(tile))
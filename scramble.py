@@ -0,0 +1,144 @@
+import argparse
+import json
+import random
+import sys
+
+import distance_table
+from algorithms import is_solvable, solve
+from board_encoding import BoardEncoding
+from heuristics import ManhattanDistance
+from pattern_database import unrank_positions
+from successors import neighbor_table
+
+
+def goal_tiles(size):
+    """The flat goal board: tiles in order with the empty tile (None) last."""
+    return list(range(1, size**2)) + [None]
+
+
+def random_board(size, rng=random):
+    """Draw a uniformly random solvable board as a flat list (None is empty).
+
+    Half of all permutations are unsolvable. Swapping the first two tiles
+    pairs every unsolvable board with exactly one solvable board, so fixing
+    them that way keeps the result uniform.
+    """
+    tiles = goal_tiles(size)
+    rng.shuffle(tiles)
+    if not is_solvable(size, tiles, goal_tiles(size)):
+        first, second = [i for i, tile in enumerate(tiles) if tile][:2]
+        tiles[first], tiles[second] = tiles[second], tiles[first]
+    return tiles
+
+
+def random_walk(size, length, rng=random):
+    """Scramble the goal board with a random walk that never undoes a move."""
+    neighbors = neighbor_table(size)
+    tiles = goal_tiles(size)
+    empty_i = size**2 - 1
+    previous = -1
+    for _ in range(length):
+        target = rng.choice([cell for cell in neighbors[empty_i] if cell != previous])
+        tiles[empty_i], tiles[target] = tiles[target], None
+        previous, empty_i = empty_i, target
+    return tiles
+
+
+def optimal_distance(size, tiles):
+    """Length of an optimal solution of a flat board.
+
+    3x3 boards are looked up in the distance table; larger boards are solved
+    with IDA* and the strongest cheap heuristic.
+    """
+    if size == distance_table.SIZE:
+        positions = [0] * size**2
+        for cell, tile in enumerate(tiles):
+            positions[tile or 0] = cell
+        return distance_table.shared_table().distance(positions)
+
+    heuristic = "Linear Conflict" if size <= 4 else "Manhattan"
+    return len(solve(tiles, "IDA*", heuristic)[0])
+
+
+def board_at_distance(size, distance, rng=random, max_attempts=1000):
+    """Draw a board whose optimal solution is exactly ``distance`` moves.
+
+    3x3 boards are drawn uniformly from all boards at that distance, using
+    the distance table. Larger boards come from random walks of exactly
+    ``distance`` moves, kept if no shorter solution exists. This is checked
+    with IDA*, so long distances on large boards can take a while. Raises
+    ValueError for negative distances, 3x3 distances over
+    ``distance_table.MAX_DISTANCE``, or if no board is found.
+    """
+    if distance < 0:
+        raise ValueError(f"The distance must be at least 0, not {distance}")
+    if size == distance_table.SIZE:
+        ranks = distance_table.shared_table().ranks_at(distance)
+        if not ranks:
+            raise ValueError(f"No 3x3 board is {distance} moves from the goal")
+        positions = unrank_positions(rng.choice(ranks), size**2, size**2)
+        tiles = [None] * size**2
+        for tile, cell in enumerate(positions):
+            tiles[cell] = tile or None
+        return tiles
+
+    encoding = BoardEncoding(size)
+    estimator = ManhattanDistance(encoding)
+    for _ in range(max_attempts):
+        # The walk solves the board in ``distance`` moves, so the board is at
+        # that distance unless a shorter solution exists
+        tiles = random_walk(size, distance, rng)
+        if estimator.evaluate(encoding.encode(tiles)) == distance:
+            return tiles  # The lower bound proves no shorter solution exists
+        if optimal_distance(size, tiles) == distance:
+            return tiles
+    raise ValueError(
+        f"No {size}x{size} board {distance} moves from the goal found "
+        f"in {max_attempts} attempts"
+    )
+
+
+def scrambles(size, count, seed=None, distance=None):
+    """Generate ``count`` boards, uniformly random or at an exact distance.
+
+    The same seed always gives the same boards.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        if distance is None:
+            yield random_board(size, rng)
+        else:
+            yield board_at_distance(size, distance, rng)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate solvable sliding puzzle boards as JSONL."
+    )
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--distance",
+        type=int,
+        default=None,
+        help="exact optimal solution length (default: uniformly random boards)",
+    )
+    parser.add_argument(
+        "-o", "--output", default="-", help="JSONL file (default: stdout)"
+    )
+    args = parser.parse_args()
+
+    output_file = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for index, board in enumerate(
+            scrambles(args.size, args.count, args.seed, args.distance), start=1
+        ):
+            output_file.write(json.dumps({"id": index, "board": board}) + "\n")
+    finally:
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+if __name__ == "__main__":
+    main()
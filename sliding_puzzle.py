@@ -1,23 +1,32 @@
-import random
 import sys
 from PyQt5.QtCore import QTimer
 from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import (
     QApplication,
     QComboBox,
-    QGridLayout,
+    QLabel,
     QMessageBox,
+    QProgressBar,
     QPushButton,
     QSpinBox,
     QVBoxLayout,
     QWidget,
 )
 
-from algorithms import PuzzleAlgorithms
-from comparison_mode import SlidingPuzzleComparison
+from algorithms import SOLVERS
+from comparison_mode import AlgorithmRunner, SlidingPuzzleComparison, format_progress
+from heuristics import HEURISTICS
+from puzzle_board import PuzzleBoard
+from scramble import random_board
+from solution_cache import SolutionCache
 
 # List of available algorithms
-ALGORITHMS = ["Select an algorithm", "BFS", "Bidirectional", "A*"]
+ALGORITHMS = ["Select an algorithm"] + list(SOLVERS)
+
+ANYTIME_TIME_LIMIT = 10  # Seconds Anytime A* keeps refining its solution
+
+# Solutions found during this session, shared by all Normal Mode windows
+solution_cache = SolutionCache()
 
 
 class ModeSelection(QWidget):
@@ -69,13 +78,19 @@ class SlidingPuzzleNormal(QWidget):
 
         self.layout = QVBoxLayout()
 
-        self.puzzle_frame = QGridLayout()
-        self.layout.addLayout(self.puzzle_frame)
+        self.board = PuzzleBoard(self.size)
+        self.board.tile_clicked.connect(self.move_tile)
+        self.layout.addWidget(self.board)
 
         self.algorithm_selector = QComboBox()
         self.algorithm_selector.addItems(ALGORITHMS)
         self.layout.addWidget(self.algorithm_selector)
 
+        # Heuristic used by the informed algorithms
+        self.heuristic_selector = QComboBox()
+        self.heuristic_selector.addItems(list(HEURISTICS))
+        self.layout.addWidget(self.heuristic_selector)
+
         self.speed_selector = QSpinBox()
         self.speed_selector.setMinimum(100)
         self.speed_selector.setMaximum(1000)
@@ -86,6 +101,27 @@ class SlidingPuzzleNormal(QWidget):
         self.solve_button.clicked.connect(self.solve_automatically)
         self.layout.addWidget(self.solve_button)
 
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.clicked.connect(self.stop_button_clicked)
+        self.stop_button.setEnabled(False)
+        self.layout.addWidget(self.stop_button)
+
+        # Progress of the running search, which runs in a worker process
+        self.status_label = QLabel()
+        self.layout.addWidget(self.status_label)
+        self.progress_label = QLabel()
+        self.layout.addWidget(self.progress_label)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)  # Busy indicator
+        self.progress_bar.hide()
+        self.layout.addWidget(self.progress_bar)
+        self.runner = None
+
+        # Solution being animated
+        self.move_sequence = None
+        self.move_index = 0
+        self.timer = None
+
         self.shuffle_button = QPushButton("Shuffle")
         self.shuffle_button.clicked.connect(self.shuffle_tiles_and_redraw)
         self.layout.addWidget(self.shuffle_button)
@@ -104,49 +140,22 @@ class SlidingPuzzleNormal(QWidget):
         ]
 
     def shuffle_tiles(self):
-        """Shuffle the tiles by randomly moving them."""
-        for _ in range(10000):
-            self.move_random_tile()
+        """Replace the tiles with a uniformly random solvable board."""
+        flat_tiles = random_board(self.size)
+        self.tiles = [
+            flat_tiles[i : i + self.size] for i in range(0, len(flat_tiles), self.size)
+        ]
+        self.empty_tile = divmod(flat_tiles.index(None), self.size)
 
     def shuffle_tiles_and_redraw(self):
         """Shuffle the tiles and redraw the puzzle."""
+        self.stop_solve()
         self.shuffle_tiles()
         self.draw_tiles()
 
-    def move_random_tile(self):
-        """Move a random tile into the empty space. Or move the empty space randomly. Think of it as you'd like:)"""
-        y, x = self.empty_tile
-        moves = []
-
-        if y > 0:
-            moves.append((y - 1, x))  # Up
-        if y < self.size - 1:
-            moves.append((y + 1, x))  # Down
-        if x > 0:
-            moves.append((y, x - 1))  # Left
-        if x < self.size - 1:
-            moves.append((y, x + 1))  # Right
-
-        if moves:
-            new_x, new_y = random.choice(moves)
-            self.tiles[y][x], self.tiles[new_x][new_y] = (
-                self.tiles[new_x][new_y],
-                self.tiles[y][x],
-            )
-            self.empty_tile = (new_x, new_y)
-
     def draw_tiles(self):
         """Draw the tiles on the grid."""
-        for i in reversed(range(self.size)):
-            for j in range(self.size):
-                tile = self.tiles[i][j]
-                button = QPushButton(str(tile) if tile is not None else "")
-                button.setFixedSize(100, 100)
-                if tile is not None:
-                    button.clicked.connect(
-                        lambda checked, x=i, y=j: self.move_tile(x, y)
-                    )
-                self.puzzle_frame.addWidget(button, i, j)
+        self.board.set_tiles(self.tiles)
 
     def move_tile(self, x, y):
         """Move a tile to the empty space if possible."""
@@ -160,7 +169,9 @@ class SlidingPuzzleNormal(QWidget):
                 self.tiles[empty_x][empty_y],
             )
             self.empty_tile = (x, y)
-            self.draw_tiles()
+            # Only the two cells of the move change
+            self.board.set_tile(empty_x, empty_y, self.tiles[empty_x][empty_y])
+            self.board.set_tile(x, y, None)
             if self.check_win():
                 mbox = QMessageBox()
                 mbox.setIcon(QMessageBox.Information)
@@ -176,38 +187,145 @@ class SlidingPuzzleNormal(QWidget):
         return current == expected
 
     def solve_automatically(self):
-        """Solve the puzzle automatically using the selected algorithm."""
-        selected_algorithm = self.algorithm_selector.currentText()
-        alg = PuzzleAlgorithms(self.size, self.tiles, self.empty_tile)
-        path = None
-
-        if selected_algorithm == "BFS":
-            path, _, __ = alg.bfs()
-        elif selected_algorithm == "Bidirectional":
-            path, _, __ = alg.bidirectional()
-        elif selected_algorithm == "A*":
-            path, _, __ = alg.a_star()
+        """Solve the puzzle automatically using the selected algorithm.
 
+        The search runs in a worker process, so the window stays responsive
+        and the search can be stopped. Its solution is animated once found.
+        """
+        selected_algorithm = self.algorithm_selector.currentText()
+        selected_heuristic = self.heuristic_selector.currentText()
+
+        if selected_algorithm == "Select an algorithm":
+            mbox = QMessageBox()
+            mbox.setIcon(QMessageBox.Warning)
+            mbox.setWindowTitle("Select Algorithm")
+            mbox.setText("Please select a valid algorithm.")
+            mbox.addButton(QMessageBox.Ok)
+            mbox.exec_()
+            return
+
+        self.stop_solve()
+        self.status_label.clear()
         # Get the speed from the spin box
         solving_speed = self.speed_selector.value()
 
+        flat_tiles = [tile for row in self.tiles for tile in row]
+        path = solution_cache.get(
+            self.size, flat_tiles, None, selected_algorithm, selected_heuristic
+        )
         if path is not None:
             self.animate_solution(path, solving_speed)
+            return
+
+        # Anytime A* refines its solution until its time limit
+        time_limit = ANYTIME_TIME_LIMIT if selected_algorithm == "Anytime A*" else None
+        self.solve_start = self.empty_tile
+        self.solve_tiles = flat_tiles
+        self.runner = AlgorithmRunner(
+            selected_algorithm,
+            self.size,
+            [row[:] for row in self.tiles],
+            self.empty_tile,
+            selected_heuristic,
+            time_limit,
+        )
+        self.runner.progress.connect(self.show_solve_progress)
+        self.runner.solution_found.connect(self.anytime_solution_found)
+        self.runner.result_ready.connect(self.solve_finished)
+        self.runner.run()
+
+        self.progress_label.setText(f"{self.runner.name()}: searching...")
+        self.set_solving(True)
+
+    def set_solving(self, solving):
+        """Show or hide the progress of a running search."""
+        self.solve_button.setEnabled(not solving)
+        self.stop_button.setEnabled(solving)
+        self.progress_bar.setVisible(solving)
+        if not solving:
+            self.progress_label.clear()
+
+    def show_solve_progress(self, metrics):
+        """Show the latest metrics of the running search."""
+        if self.sender() is self.runner:
+            self.progress_label.setText(format_progress(self.runner.name(), metrics))
+
+    def solve_finished(self, result):
+        """Animate the solution of the search, or report why there is none."""
+        runner = self.sender()
+        if runner is not self.runner:
+            return  # Result of an earlier, stopped search
+        self.runner = None
+        self.set_solving(False)
+
+        path = result.get("path")
+        if path is None:
+            mbox = QMessageBox()
+            mbox.setIcon(QMessageBox.Critical)
+            mbox.setWindowTitle("No Solution")
+            mbox.setText(
+                "Unable to solve the puzzle automatically.\n"
+                + result.get("error", "No solution found")
+            )
+            mbox.addButton(QMessageBox.Ok)
+            mbox.exec_()
+            return
+
+        solution_cache.put(
+            self.size, self.solve_tiles, None, runner.algorithm, runner.heuristic, path
+        )
+        if self.move_sequence is not None:
+            return  # Anytime A* is already animating a solution
+        if [tile for row in self.tiles for tile in row] != self.solve_tiles:
+            self.status_label.setText("The board was changed during the search")
+            return
+        self.animate_solution(path, self.speed_selector.value())
+
+    def anytime_solution_found(self, path, bound):
+        """Animate the first Anytime A* solution, or switch to a shorter one.
+
+        Improved solutions replace the rest of the animation as long as they
+        start with the moves already made.
+        """
+        if self.sender() is not self.runner:
+            return  # Solution of an earlier, stopped search
+
+        # The search includes the starting empty tile in its path
+        if path and path[0] == self.solve_start:
+            path = path[1:]
+
+        if bound <= 1:
+            quality = "optimal"
         else:
-            if selected_algorithm == "Select an algorithm":
-                mbox = QMessageBox()
-                mbox.setIcon(QMessageBox.Warning)
-                mbox.setWindowTitle("Select Algorithm")
-                mbox.setText("Please select a valid algorithm.")
-                mbox.addButton(QMessageBox.Ok)
-                mbox.exec_()
-            else:
-                mbox = QMessageBox()
-                mbox.setIcon(QMessageBox.Critical)
-                mbox.setWindowTitle("No Solution")
-                mbox.setText("Unable to solve the puzzle automatically.")
-                mbox.addButton(QMessageBox.Ok)
-                mbox.exec_()
+            quality = f"at most {bound:.2f} times optimal"
+        self.status_label.setText(f"Anytime A*: {len(path)} moves, {quality}")
+
+        if self.move_sequence is None:
+            self.animate_solution(path, self.speed_selector.value())
+        elif (
+            len(path) < len(self.move_sequence)
+            and path[: self.move_index] == self.move_sequence[: self.move_index]
+        ):
+            self.move_sequence = path
+
+    def stop_button_clicked(self):
+        """Stop the running search at the user's request."""
+        self.stop_solve()
+        self.status_label.setText("Stopped")
+
+    def stop_solve(self):
+        """Stop the running search, if any, and the animation."""
+        if self.timer is not None:
+            self.timer.stop()
+        self.move_sequence = None
+        if self.runner is not None:
+            runner, self.runner = self.runner, None
+            runner.cancel()
+            self.set_solving(False)
+
+    def closeEvent(self, event):
+        self.stop_solve()
+        super().closeEvent(event)
 
     def animate_solution(self, path, solving_speed):
         """Animate the solution path."""
@@ -0,0 +1,144 @@
+import json
+import os
+from collections import OrderedDict
+
+from algorithms import BOUNDED_SOLVERS, INFORMED_SOLVERS, OPTIMAL_SOLVERS, SOLVERS
+from board_encoding import BoardEncoding
+from table_files import write_atomically
+
+# Version of the JSON file format written by SolutionCache.save
+FORMAT_VERSION = 1
+
+
+class SolutionCache:
+    """Bounded LRU cache of solutions, optionally persisted to a JSON file.
+
+    Entries are keyed by the packed start and goal boards plus the algorithm
+    and (for informed algorithms) the heuristic name. Moves are stored as
+    the (y, x) cell of the tile slid into the empty space at every step.
+
+    Every state along an optimal path is solved optimally by the rest of that
+    path, so putting an optimal solution also registers each of its states as
+    a reference into it. References count towards ``max_entries`` like
+    solutions do and are dropped once the solution they point to is evicted.
+    """
+
+    def __init__(self, max_entries=100000, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def key(self, size, flat_tiles, goal_tiles, algorithm, heuristic):
+        """Canonical cache key of a request, or None if it cannot be cached."""
+        algorithm = SOLVERS.get(algorithm, algorithm)
+        if algorithm in BOUNDED_SOLVERS:
+            return None  # Their paths depend on the weight and time limit
+        if algorithm in INFORMED_SOLVERS:
+            heuristic = heuristic or "Manhattan"
+            if not isinstance(heuristic, str):
+                return None  # Heuristic objects have no stable name
+        else:
+            heuristic = ""
+
+        encoding = BoardEncoding(size)
+        if goal_tiles is None:
+            goal = encoding.goal
+        else:
+            goal = encoding.encode(goal_tiles)
+        return (size, encoding.encode(flat_tiles), goal, algorithm, heuristic)
+
+    def get(self, size, flat_tiles, goal_tiles, algorithm, heuristic=None):
+        """Look up the moves solving a board, or None on a cache miss."""
+        key = self.key(size, flat_tiles, goal_tiles, algorithm, heuristic)
+        moves = self.lookup(key)
+        if moves is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return moves
+
+    def lookup(self, key):
+        """Resolve a key to its moves, following suffix references."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        kind, value = entry
+        if kind == "suffix":
+            root_key, offset = value
+            root = self.entries.get(root_key)
+            if root is None:
+                # The solution it pointed into has been evicted
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(root_key)
+            self.entries.move_to_end(key)
+            return list(root[1][offset:])
+
+        self.entries.move_to_end(key)
+        return list(value)
+
+    def put(self, size, flat_tiles, goal_tiles, algorithm, heuristic, moves):
+        """Store the moves solving a board, with its suffixes if they are optimal."""
+        key = self.key(size, flat_tiles, goal_tiles, algorithm, heuristic)
+        if key is None or moves is None:
+            return
+
+        moves = [tuple(move) for move in moves]
+        if key[3] in OPTIMAL_SOLVERS:
+            encoding = BoardEncoding(size)
+            state = key[1]
+            empty_i = encoding.blank_index(state)
+            for offset, (y, x) in enumerate(moves[:-1], start=1):
+                target = y * size + x
+                state = encoding.slide(state, empty_i, target)
+                empty_i = target
+                suffix_key = (size, state, key[2], key[3], key[4])
+                if self.entries.get(suffix_key, ("suffix",))[0] == "suffix":
+                    self.store(suffix_key, ("suffix", (key, offset)))
+
+        # Stored last so it outlives its own suffix references
+        self.store(key, ("path", moves))
+
+    def store(self, key, entry):
+        """Insert an entry and evict the least recently used ones over the limit."""
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def save(self, path=None):
+        """Write the cache to a JSON file, least recently used entries first."""
+        path = path or self.path
+        data = {"version": FORMAT_VERSION, "entries": list(self.entries.items())}
+        write_atomically(path, json.dumps(data).encode())
+
+    def load(self, path=None):
+        """Read entries saved by ``save``, keeping the LRU order.
+
+        Files of another format version raise ValueError.
+        """
+        path = path or self.path
+        with open(path) as cache_file:
+            data = json.load(cache_file)
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(
+                f"{path} has solution cache format version {data.get('version')}, "
+                f"expected {FORMAT_VERSION}"
+            )
+
+        for key, (kind, value) in data["entries"]:
+            if kind == "suffix":
+                root_key, offset = value
+                value = (tuple(root_key), offset)
+            else:
+                value = [tuple(move) for move in value]
+            self.store(tuple(key), (kind, value))
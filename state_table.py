@@ -0,0 +1,136 @@
+from array import array
+
+# No board packs to 0 (it would have no tiles), so 0 marks a free slot
+FREE = 0
+# States must fit into the 64-bit slots of the key array (up to 4x4 boards)
+MAX_STATE_BITS = 64
+
+# Fibonacci hashing: the top bits of the state times 2^64 / golden ratio
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+HASH_MASK = (1 << 64) - 1
+
+MIN_CAPACITY = 1024
+MAX_LOAD = 0.7  # Fraction of slots in use before the table doubles
+
+
+class StateTable:
+    """Compact map from packed states to parent links, for blind searches.
+
+    Open addressing with linear probing over a flat array of 64-bit states,
+    with the value of every slot (an empty tile index from -1 to 254) in a
+    parallel byte array. That costs 9 bytes per slot, or 13 to 26 bytes per
+    state, where a dict with its int objects needs over 100. Supports the
+    ``in``, ``[]`` and ``len`` operations that the searches use on dicts.
+    """
+
+    def __init__(self, capacity=MIN_CAPACITY):
+        self.count = 0
+        self.allocate(max(MIN_CAPACITY, 1 << (capacity - 1).bit_length()))
+
+    def allocate(self, capacity):
+        """Replace the arrays with empty ones of ``capacity`` slots (a power of 2)."""
+        self.keys = array("Q", bytes(8 * capacity))
+        self.values = bytearray(capacity)
+        self.mask = capacity - 1
+        self.shift = 64 - (capacity.bit_length() - 1)
+        self.limit = int(capacity * MAX_LOAD)
+
+    def slot(self, state):
+        """Index of the slot holding ``state``, or of the free slot it would take."""
+        keys = self.keys
+        mask = self.mask
+        index = (state * HASH_MULTIPLIER & HASH_MASK) >> self.shift
+        while True:
+            key = keys[index]
+            if key == state or key == FREE:
+                return index
+            index = (index + 1) & mask
+
+    def add(self, state, value):
+        """Store ``value`` for a new state; return False if it is already present."""
+        keys = self.keys
+        mask = self.mask
+        # slot, inlined since this is called for every generated state
+        index = (state * HASH_MULTIPLIER & HASH_MASK) >> self.shift
+        while True:
+            key = keys[index]
+            if key == state:
+                return False
+            if key == FREE:
+                break
+            index = (index + 1) & mask
+        keys[index] = state
+        self.values[index] = value + 1
+        self.count += 1
+        if self.count > self.limit:
+            self.grow()
+        return True
+
+    def grow(self):
+        """Double the capacity and insert every stored state again."""
+        old_keys = self.keys
+        old_values = self.values
+        self.allocate(2 * len(old_keys))
+        keys = self.keys
+        values = self.values
+        mask = self.mask
+        shift = self.shift
+        for old_index, key in enumerate(old_keys):
+            if key != FREE:
+                # States are unique, so only a free slot has to be found
+                index = (key * HASH_MULTIPLIER & HASH_MASK) >> shift
+                while keys[index] != FREE:
+                    index = (index + 1) & mask
+                keys[index] = key
+                values[index] = old_values[old_index]
+
+    def __contains__(self, state):
+        keys = self.keys
+        mask = self.mask
+        index = (state * HASH_MULTIPLIER & HASH_MASK) >> self.shift
+        while True:
+            key = keys[index]
+            if key == state:
+                return True
+            if key == FREE:
+                return False
+            index = (index + 1) & mask
+
+    def __getitem__(self, state):
+        index = self.slot(state)
+        if self.keys[index] == FREE:
+            raise KeyError(state)
+        return self.values[index] - 1
+
+    def __setitem__(self, state, value):
+        index = self.slot(state)
+        if self.keys[index] == FREE:
+            self.keys[index] = state
+            self.count += 1
+        self.values[index] = value + 1
+        if self.count > self.limit:
+            self.grow()
+
+    def __len__(self):
+        return self.count
+
+
+class ParentDict(dict):
+    """Dict with the ``add`` method of StateTable, for states too wide for it."""
+
+    def add(self, state, value):
+        """Store ``value`` for a new state; return False if it is already present."""
+        if state in self:
+            return False
+        self[state] = value
+        return True
+
+
+def parent_table(encoding):
+    """An empty map for the parent links of a search over ``encoding``'s boards.
+
+    A StateTable if the states fit into its slots, otherwise a ParentDict.
+    """
+    if encoding.cells * encoding.bits > MAX_STATE_BITS:
+        return ParentDict()
+    return StateTable()
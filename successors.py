@@ -0,0 +1,155 @@
+from functools import lru_cache
+
+# Directions the empty tile moves in, and their (row, column) steps. The
+# inverse of direction d is d ^ 1.
+DIRECTIONS = "udlr"
+STEPS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+# Longest move sequences checked for redundancy by pruning_automaton
+PRUNING_LENGTH = 8
+
+
+@lru_cache(maxsize=None)
+def move_table(rows, columns=None):
+    """Moves of the empty tile on a rows x columns board (square by default).
+
+    ``move_table(size)[cell]`` holds a ``(target, direction)`` pair for every
+    cell the empty tile can move to from ``cell``, direction being an index
+    into DIRECTIONS.
+    """
+    if columns is None:
+        columns = rows
+    moves = []
+    for cell in range(rows * columns):
+        y, x = divmod(cell, columns)
+        moves.append(
+            tuple(
+                ((y + dy) * columns + x + dx, direction)
+                for direction, (dy, dx) in enumerate(STEPS)
+                if 0 <= y + dy < rows and 0 <= x + dx < columns
+            )
+        )
+    return tuple(moves)
+
+
+@lru_cache(maxsize=None)
+def neighbor_table(rows, columns=None):
+    """Cells the empty tile can move to from every cell, see move_table."""
+    return tuple(
+        tuple(target for target, _ in cell_moves)
+        for cell_moves in move_table(rows, columns)
+    )
+
+
+def sequence_effect(directions):
+    """What a sequence of empty tile moves does to any board it is valid on.
+
+    Returns the final offset of the empty tile, the tiles moved (as pairs of
+    their final and original offsets) and the bounding box of the offsets
+    the empty tile visited. Offsets are relative to its starting cell.
+    """
+    blank = (0, 0)
+    origins = {}  # Current offset -> original offset of the tile there
+    rows = [0]
+    columns = [0]
+    for direction in directions:
+        dy, dx = STEPS[direction]
+        target = (blank[0] + dy, blank[1] + dx)
+        origins[blank] = origins.pop(target, target)
+        blank = target
+        rows.append(blank[0])
+        columns.append(blank[1])
+
+    moved = frozenset(
+        (cell, origin) for cell, origin in origins.items() if cell != origin
+    )
+    return (blank, moved), (min(rows), max(rows), min(columns), max(columns))
+
+
+def box_contains(outer, inner):
+    """Whether bounding box ``inner`` lies within bounding box ``outer``."""
+    return (
+        outer[0] <= inner[0]
+        and inner[1] <= outer[1]
+        and outer[2] <= inner[2]
+        and inner[3] <= outer[3]
+    )
+
+
+def redundant_sequences(max_length):
+    """Move sequences that some shorter or equally long sequence can replace.
+
+    A sequence is redundant if an earlier one, shorter or equally long and
+    smaller in DIRECTIONS order, has the same effect on the board and keeps
+    the empty tile within the cells it visited (so it is valid wherever the
+    redundant one is). Any path containing a redundant sequence can then be
+    replaced by a shorter or smaller one, so the smallest of the shortest
+    paths to every board contains none. Only sequences without a shorter
+    redundant part are returned.
+    """
+    redundant = set()
+    effect, box = sequence_effect(())
+    # Effect -> bounding boxes of the kept sequences with that effect
+    boxes = {effect: [box]}
+    # Kept sequences of the previous length, in DIRECTIONS order
+    kept = [()]
+    for length in range(1, max_length + 1):
+        extended = []
+        for sequence in kept:
+            for direction in range(len(DIRECTIONS)):
+                new_sequence = sequence + (direction,)
+                if any(new_sequence[start:] in redundant for start in range(length)):
+                    continue  # Pruned anyway by its redundant end
+
+                effect, box = sequence_effect(new_sequence)
+                earlier = boxes.setdefault(effect, [])
+                if any(box_contains(box, other) for other in earlier):
+                    redundant.add(new_sequence)
+                else:
+                    earlier.append(box)
+                    extended.append(new_sequence)
+        kept = extended
+    return redundant
+
+
+@lru_cache(maxsize=None)
+def pruning_automaton(max_length=PRUNING_LENGTH):
+    """Finite-state machine rejecting paths with a redundant move sequence.
+
+    ``pruning_automaton()[state][direction]`` is the state after moving the
+    empty tile in ``direction``, or -1 if that move completes a redundant
+    sequence (see redundant_sequences) and can be skipped. Searches start in
+    state 0. Undoing the previous move is always redundant, so a length of 2
+    gives the usual inverse-move pruning. Only depth-first searches without
+    duplicate detection may use it: a state they reach along one path could
+    have been pruned along another.
+    """
+    redundant = redundant_sequences(max_length)
+    prefixes = {
+        sequence[:end] for sequence in redundant for end in range(len(sequence))
+    }
+
+    # Each state is the longest end of the moves so far that starts a
+    # redundant sequence
+    states = {(): 0}
+    transitions = []
+    pending = [()]
+    while pending:
+        history = pending.pop(0)
+        row = []
+        for direction in range(len(DIRECTIONS)):
+            moves = history + (direction,)
+            if any(moves[start:] in redundant for start in range(len(moves))):
+                row.append(-1)
+                continue
+            suffix = next(
+                moves[start:]
+                for start in range(len(moves) + 1)
+                if moves[start:] in prefixes
+            )
+            if suffix not in states:
+                states[suffix] = len(states)
+                pending.append(suffix)
+            row.append(states[suffix])
+        transitions.append(tuple(row))
+    return tuple(transitions)
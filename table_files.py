@@ -0,0 +1,37 @@
+import mmap
+import os
+
+
+def write_atomically(path, data):
+    """Write ``data`` (bytes) to ``path`` through a temporary file.
+
+    The temporary file is renamed over ``path`` once complete, so readers see
+    either the old file or the whole new one. A file that another process
+    has memory-mapped is replaced rather than truncated under it. The
+    temporary name includes the process ID, so that processes writing the
+    same file at once do not clash.
+    """
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, "wb") as output_file:
+            output_file.write(data)
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+
+def map_table(path, expected_length):
+    """Memory-map a byte table read-only, checking its length.
+
+    The operating system shares the mapped pages between every process that
+    maps the same file, and nothing is read until it is used.
+    """
+    with open(path, "rb") as table_file:
+        table = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+    length = len(table)
+    if length != expected_length:
+        table.close()
+        raise ValueError(f"{path} has {length} entries, expected {expected_length}")
+    return table
@@ -0,0 +1,77 @@
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, only the vectorized searches need it
+    np = None
+
+from successors import move_table
+
+# Packed states must fit into one unsigned 64-bit integer (up to 4x4 boards)
+MAX_STATE_BITS = 64
+
+
+def check_available(encoding):
+    """Raise ValueError if boards of ``encoding`` cannot be searched here."""
+    if np is None:
+        raise ValueError("The vectorized searches need NumPy (pip install numpy)")
+    if encoding.cells * encoding.bits > MAX_STATE_BITS:
+        raise ValueError("The vectorized searches support boards up to 4x4")
+
+
+def blank_moves(size):
+    """Move table of the empty tile: ``moves[d, cell]`` is the cell it can
+    move to in direction ``d`` (up, down, left, right), or -1 at the edge."""
+    moves = np.full((4, size**2), -1, dtype=np.int64)
+    for cell, cell_moves in enumerate(move_table(size)):
+        for target, direction in cell_moves:
+            moves[direction, cell] = target
+    return moves
+
+
+def expand(states, blanks, moves, bits):
+    """Generate all children of a layer at once.
+
+    ``states`` holds packed states as uint64 and ``blanks`` the cells of
+    their empty tiles. Returns the children's states and empty tile cells,
+    one block per direction, in the same format.
+    """
+    mask = np.uint64((1 << bits) - 1)
+    child_states = []
+    child_blanks = []
+    for direction_moves in moves:
+        targets = direction_moves[blanks]
+        allowed = targets >= 0
+        parents = states[allowed]
+        targets = targets[allowed]
+        target_shifts = (targets * bits).astype(np.uint64)
+        blank_shifts = (blanks[allowed] * bits).astype(np.uint64)
+        tiles = (parents >> target_shifts) & mask
+        # The empty cell holds 0, so moving the tile is one subtract and add
+        child_states.append(
+            parents - (tiles << target_shifts) + (tiles << blank_shifts)
+        )
+        child_blanks.append(targets)
+    return np.concatenate(child_states), np.concatenate(child_blanks)
+
+
+def contains(sorted_states, states):
+    """Boolean mask of the ``states`` present in the sorted array ``sorted_states``."""
+    if not len(sorted_states):
+        return np.zeros(len(states), dtype=bool)
+    index = np.searchsorted(sorted_states, states)
+    index[index == len(sorted_states)] = 0
+    return sorted_states[index] == states
+
+
+def next_layer(layer, blanks, previous_layer, moves, bits):
+    """The sorted, duplicate-free states one move beyond ``layer``.
+
+    Every move moves the empty tile between a light and a dark cell of a
+    checkerboard, so the state graph has no odd cycles and children are never
+    in their parents' own layer. Removing the previous layer is therefore
+    enough to keep only states that have not been visited before.
+    """
+    children, child_blanks = expand(layer, blanks, moves, bits)
+    children, first = np.unique(children, return_index=True)
+    child_blanks = child_blanks[first]
+    new = ~contains(previous_layer, children)
+    return children[new], child_blanks[new]